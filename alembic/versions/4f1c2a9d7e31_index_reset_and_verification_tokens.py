@@ -0,0 +1,30 @@
+"""Index reset and verification tokens
+
+Revision ID: 4f1c2a9d7e31
+Revises: b6cf6633c7eb
+Create Date: 2026-10-17 10:12:04.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1c2a9d7e31'
+down_revision: Union[str, Sequence[str], None] = 'b6cf6633c7eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_password_resets_token'), 'password_resets', ['token'], unique=False)
+    op.create_index(op.f('ix_pending_users_verification_token'), 'pending_users', ['verification_token'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pending_users_verification_token'), table_name='pending_users')
+    op.drop_index(op.f('ix_password_resets_token'), table_name='password_resets')
@@ -0,0 +1,30 @@
+"""Add booking pagination indexes
+
+Revision ID: 9b3e6d0c5a72
+Revises: 4f1c2a9d7e31
+Create Date: 2026-10-17 11:02:47.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e6d0c5a72'
+down_revision: Union[str, Sequence[str], None] = '4f1c2a9d7e31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_customer_created', 'bookings', ['customer_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_bookings_salon_created', 'bookings', ['salon_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_salon_created', table_name='bookings')
+    op.drop_index('ix_bookings_customer_created', table_name='bookings')
@@ -0,0 +1,19 @@
+from app.core.config import settings
+
+# Redis is optional: without REDIS_URL (or the redis package) callers fall back to the database
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    print("⚠️ redis not available, using database fallbacks")
+
+redis_client = None
+if REDIS_AVAILABLE and settings.REDIS_URL:
+    redis_client = redis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_timeout=1,
+        socket_connect_timeout=1
+    )
+    print("✅ Redis client configured")
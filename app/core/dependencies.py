@@ -1,18 +1,74 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Enum
+from sqlalchemy.orm import Session, defer, make_transient_to_detached
+from datetime import datetime
+import json
+import logging
 from app.database import get_db
 from app.core.security import verify_token
+from app.core.cache import redis_client
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
+USER_CACHE_TTL = 60
+# The password hash never goes into the cache; a cached user loads it on first access
+_USER_COLUMNS = [column for column in User.__table__.columns if column.key != "password"]
+
+def _user_cache_key(user_id) -> str:
+    return f"user:{user_id}"
+
+def _dump_user(user: User) -> str:
+    data = {}
+    for column in _USER_COLUMNS:
+        value = getattr(user, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif hasattr(value, "value"):
+            value = value.value
+        data[column.key] = value
+    return json.dumps(data)
+
+def _load_user(raw: str) -> User:
+    data = json.loads(raw)
+    for column in _USER_COLUMNS:
+        value = data.get(column.key)
+        if value is None:
+            continue
+        if isinstance(column.type, DateTime):
+            data[column.key] = datetime.fromisoformat(value)
+        elif isinstance(column.type, Enum):
+            data[column.key] = column.type.enum_class(value)
+    user = User(**data)
+    # Mark it as an already-persisted row so it can be attached without a SELECT;
+    # columns left out of the cache are expired and load from the database if read
+    make_transient_to_detached(user)
+    return user
+
+def invalidate_cached_user(user_id) -> None:
+    """Drop the cached user so the next request reloads it from the database"""
+    if redis_client is not None:
+        # The change is already committed; a stale entry only lives for USER_CACHE_TTL
+        try:
+            redis_client.delete(_user_cache_key(user_id))
+        except Exception as e:
+            logger.warning("User cache unavailable: %s", e)
+
+# FastAPI caches dependency results per request, so the token is verified once
+# even when several dependencies of a route need the payload
+def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Verified payload of the bearer token, or None if it is invalid"""
+    return verify_token(credentials.credentials)
+
+# Plain def so FastAPI runs the blocking user lookup in its threadpool
+# instead of on the event loop
+def get_current_user(
+    payload: dict = Depends(get_token_payload),
     db: Session = Depends(get_db)
 ):
-    token = credentials.credentials
-    payload = verify_token(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -20,10 +76,30 @@ async def get_current_user(
         )
     
     user_id = payload.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
+    
+    # Short-lived copy of the user row in Redis, shared by all workers so
+    # invalidate_cached_user reaches every one of them. The row is attached to the
+    # session so routes can still modify and commit it
+    cached = None
+    if redis_client is not None:
+        try:
+            cached = redis_client.get(_user_cache_key(user_id))
+        except Exception as e:
+            logger.warning("User cache unavailable: %s", e)
+    if cached:
+        user = _load_user(cached)
+        db.add(user)
+        return user
+    
+    user = db.query(User).options(defer(User.password)).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    return user
\ No newline at end of file
+    if redis_client is not None:
+        try:
+            redis_client.setex(_user_cache_key(user_id), USER_CACHE_TTL, _dump_user(user))
+        except Exception as e:
+            logger.warning("User cache unavailable: %s", e)
+    return user
@@ -0,0 +1,105 @@
+import threading
+import time
+from itertools import islice
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from app.core.cache import redis_client
+
+# Token bucket: refill `rate` tokens per second up to `capacity`, each request takes one.
+# Runs as a single Lua script so concurrent workers can't race on the same bucket.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return allowed
+"""
+
+_token_bucket = redis_client.register_script(_TOKEN_BUCKET_LUA) if redis_client is not None else None
+
+# Per-process fallback when Redis is not configured. Entries are
+# (tokens, ts, full_at) in least-recently-used order
+_local_buckets = {}
+_local_lock = threading.Lock()
+_LOCAL_MAX_BUCKETS = 10000
+_LOCAL_EVICT_TO = 9000
+
+def _evict_local_buckets(now: float) -> None:
+    # A refilled bucket is the same as a fresh one, so dropping it loses nothing
+    for key in [key for key, entry in _local_buckets.items() if entry[2] <= now]:
+        del _local_buckets[key]
+    # Then the least recently used; a bucket under attack is used on every attempt,
+    # so a flood of throwaway keys can't push it out
+    excess = len(_local_buckets) - _LOCAL_EVICT_TO
+    if excess > 0:
+        for key in list(islice(_local_buckets, excess)):
+            del _local_buckets[key]
+
+def _take_local_token(key: str, capacity: int, rate: float, now: float) -> bool:
+    with _local_lock:
+        entry = _local_buckets.pop(key, None)
+        if entry is None:
+            if len(_local_buckets) >= _LOCAL_MAX_BUCKETS:
+                _evict_local_buckets(now)
+            tokens, ts = capacity, now
+        else:
+            tokens, ts, _ = entry
+        tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        _local_buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return allowed
+
+def _take_token(key: str, capacity: int, rate: float) -> bool:
+    now = time.time()
+    if _token_bucket is not None:
+        try:
+            return bool(_token_bucket(keys=[key], args=[capacity, rate, now]))
+        except Exception as e:
+            print(f"⚠️ [RATE LIMIT] Redis unavailable, using local bucket: {str(e)}")
+    return _take_local_token(key, capacity, rate, now)
+
+async def _request_email(request: Request) -> str:
+    email = request.query_params.get("email")
+    if email is None and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            email = body.get("email")
+    return str(email or "").strip().lower()
+
+def rate_limit(scope: str, capacity: int, refill_per_sec: float):
+    """Dependency that rejects with 429 once the client's IP+email bucket is empty.
+
+    request.client.host is the real client only when the server trusts the proxy's
+    X-Forwarded-For (FORWARDED_ALLOW_IPS in gunicorn.conf.py). Otherwise it is the
+    proxy address, and the bucket is effectively per email for all clients.
+    """
+    async def dependency(request: Request):
+        client_ip = request.client.host if request.client else "unknown"
+        email = await _request_email(request)
+        key = f"ratelimit:{scope}:{client_ip}:{email}"
+        if _token_bucket is not None:
+            allowed = await run_in_threadpool(_take_token, key, capacity, refill_per_sec)
+        else:
+            allowed = _take_token(key, capacity, refill_per_sec)
+        if not allowed:
+            print(f"⚠️ [RATE LIMIT] {scope} limit hit for {client_ip} {email}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later."
+            )
+    return dependency
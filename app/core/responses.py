@@ -0,0 +1,66 @@
+import gzip
+import hashlib
+from functools import lru_cache
+from fastapi import Request, Response, status
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
+
+# orjson serializes the booking/salon lists several times faster than the stdlib json
+try:
+    import orjson
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+    print("⚠️ orjson not available, using standard JSON responses")
+
+@lru_cache(maxsize=None)
+def _static_page(path: str):
+    """Read a static page once per process, plus a gzipped copy and ETags for both"""
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.md5(content).hexdigest()
+    gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+    return (content, f'"{digest}"'), (gzipped, f'"{digest}-gzip"')
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (gzip;q=0 is a refusal)"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.strip().split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0) > 0
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check: "*" or any listed tag, compared weakly (W/ is ignored)"""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def static_html_response(request: Request, path: str) -> Response:
+    """Serve an HTML file that does not change while the process runs"""
+    plain, gzipped = _static_page(path)
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    content, etag = gzipped if use_gzip else plain
+    # no-cache still lets browsers keep the page; they just revalidate with the ETag.
+    # The body depends on Accept-Encoding, so caches must key on it too
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return HTMLResponse(content=content, headers=headers)
@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from jose import JWSError, jwk, jws, jwt
+import json
+import threading
+import time
 from hashlib import sha256
 from passlib.context import CryptContext
 import bcrypt
@@ -14,6 +17,10 @@ except:
     BC_AVAILABLE = False
     print("  bcrypt not available, using SHA256")
 
+# Build the HMAC key once instead of letting jose re-parse SECRET_KEY on every sign/verify
+_JWT_KEY = jwk.construct(settings.SECRET_KEY, "HS256")
+REFRESH_TOKEN_EXPIRE = timedelta(days=7)
+
 def verify_password(plain_password: str, hashed_password: str):
     """Verify password - supports both bcrypt and SHA256"""
     if hashed_password.startswith('$2b$'):  # bcrypt hash
@@ -42,13 +49,76 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm="HS256")
     return encoded_jwt
 
+def create_token_pair(user_id: int, email: str, role: Optional[str] = None):
+    """Create the access and refresh tokens for a login in one go"""
+    now = datetime.utcnow()
+    claims = {
+        "user_id": user_id,
+        "email": email,
+        "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        "type": "access"
+    }
+    if role is not None:
+        claims["role"] = role
+    access_token = jwt.encode(claims, _JWT_KEY, algorithm="HS256")
+    refresh_token = jwt.encode(
+        {"user_id": user_id, "exp": now + REFRESH_TOKEN_EXPIRE, "type": "access"},
+        _JWT_KEY,
+        algorithm="HS256"
+    )
+    return access_token, refresh_token
+
+# Payloads of tokens whose signature checked out, until they expire. Failed
+# verifications are never stored, so junk tokens can't push valid ones out
+TOKEN_CACHE_MAX_ENTRIES = 4096
+_token_cache = {}
+_token_cache_lock = threading.Lock()
+
+def _cache_token(token: str, payload: dict, exp: float):
+    now = time.time()
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+            for expired in [key for key, entry in _token_cache.items() if entry[0] <= now]:
+                del _token_cache[expired]
+            while len(_token_cache) >= TOKEN_CACHE_MAX_ENTRIES:
+                del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (exp, payload)
+
+def _decode_token(token: str):
+    """Signature check + C json decode, cached so a client reusing its token skips the HMAC"""
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+    if entry is not None:
+        return entry[1]
+    try:
+        payload = json.loads(jws.verify(token, _JWT_KEY, algorithms=["HS256"]))
+    except (JWSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        _cache_token(token, payload, exp)
+    return payload
+
 def verify_token(token: str):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        return payload
-    except JWTError:
-        return None
\ No newline at end of file
+    payload = _decode_token(token)
+    if payload is None:
+        return None
+    # The time claims jwt.decode used to validate, checked on every call so cached
+    # tokens still expire: exp is required, nbf and iat must be numbers if present
+    now = time.time()
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= now:
+        return None
+    nbf = payload.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+        return None
+    iat = payload.get("iat")
+    if iat is not None and not isinstance(iat, (int, float)):
+        return None
+    return dict(payload)
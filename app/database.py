@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -16,9 +16,10 @@ if database_url and database_url.startswith("postgres://"):
 engine_args = {
     "echo": settings.DEBUG,
     "pool_pre_ping": True, 
-    "pool_size": 10,       
-    "max_overflow": 20,    
-    "pool_recycle": 1800   
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,  # fail fast instead of stalling workers
+    "pool_recycle": 3600
 }
 
 if not database_url:
@@ -32,6 +33,19 @@ else:
 
 engine = create_engine(database_url, **engine_args)
 
+# Database-side "now" in UTC, comparable with the naive utcnow() expiry columns.
+# Postgres now() is timestamptz, so pin it to UTC; SQLite CURRENT_TIMESTAMP is already UTC.
+if engine.dialect.name == "postgresql":
+    SQL_UTC_NOW = func.timezone("utc", func.now())
+else:
+    SQL_UTC_NOW = func.current_timestamp()
+
+# Dialect insert() that supports on_conflict_do_nothing/do_update for upserts
+if engine.dialect.name == "postgresql":
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+else:
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
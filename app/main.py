@@ -8,6 +8,8 @@ import httpx
 # IMPORT THE NEW ROUTER
 from app.routes import auth, users, salons, bookings, payments, vendor, favorites, google_oauth, kyc
 from app.core.config import settings
+from app.core.responses import DefaultResponse
+from app.database import engine
 
 async def keep_alive():
     if not settings.IS_PRODUCTION:
@@ -54,6 +56,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=DefaultResponse,
     lifespan=lifespan
 )
 
@@ -78,6 +81,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursor for /api/bookings lists, unreadable cross-origin otherwise
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -109,6 +114,19 @@ async def health_check():
         "environment": "production" if settings.IS_PRODUCTION else "development"
     }
 
+# Pool internals are diagnostic only, so like the other debug routes this is
+# registered only when DEBUG is on
+if settings.DEBUG:
+    @app.get("/health/db")
+    async def db_health_check():
+        """Connection pool usage, for sizing DB_POOL_SIZE against observed peaks"""
+        pool = engine.pool
+        return {
+            "status": "healthy",
+            "pool": pool.status(),
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None
+        }
+
 @app.get("/ping")
 async def ping():
     return {"message": "ping"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -26,6 +26,12 @@ class Booking(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Back the newest-first keyset pagination in BookingService
+    __table_args__ = (
+        Index("ix_bookings_customer_created", "customer_id", "created_at", "id"),
+        Index("ix_bookings_salon_created", "salon_id", "created_at", "id"),
+    )
+    
     customer = relationship("User", back_populates="bookings")
     salon = relationship("Salon", back_populates="bookings")
     items = relationship("BookingItem", back_populates="booking")
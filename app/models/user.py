@@ -86,7 +86,7 @@ class PasswordReset(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token = Column(Text, nullable=False)  
+    token = Column(Text, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
     used = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -104,7 +104,7 @@ class PendingUser(Base):
     first_name = Column(String(100))
     last_name = Column(String(100))
     role = Column(Enum(UserRole), default=UserRole.CUSTOMER)
-    verification_token = Column(Text, nullable=False)  
+    verification_token = Column(Text, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import exists, update
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 import os
+import html
 import jwt
 
 from app.services.auth import AuthService
@@ -14,42 +15,106 @@ from app.schemas.user import (
     ChangePasswordRequest, OTPLoginRequest, OTPVerifyRequest
 )
 from app.services.email import EmailService
-from app.core.security import verify_token, get_password_hash, create_access_token, verify_password
-from app.database import get_db
+from app.core.security import verify_token, get_password_hash, create_access_token, create_token_pair, verify_password
+from app.database import get_db, SQL_UTC_NOW
+from app.core.dependencies import get_current_user, get_token_payload, invalidate_cached_user
 from app.core.config import settings
+from app.core.cache import redis_client
+from app.core.rate_limit import rate_limit
+from app.core.responses import static_html_response
 from app.models.vendor import VendorBusinessInfo
 from app.models.salon import Salon
 from app.models.user import User, PasswordReset, PendingUser, UserOTP, UserRole
 
 router = APIRouter()
-security = HTTPBearer()
 templates = Jinja2Templates(directory="app/templates")
 
 # Use settings from config instead of os.getenv for consistency
 BASE_URL = settings.CURRENT_BASE_URL
 FRONTEND_URL = settings.FRONTEND_URL
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security), 
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user"""
-    token = credentials.credentials
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    user_id = payload.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+RESET_TOKEN_TTL = 3600
+
+def _send_email_task(send, **kwargs):
+    """Run an EmailService send as a background task and log it if the send fails"""
+    if not send(**kwargs):
+        print(f"❌ [AUTH] {send.__name__} failed for: {kwargs.get('email')}")
+
+# Static parts of the verify-email failure page, built once; only the error text changes per request
+_VERIFY_FAILED_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Verification Failed - Salon Connect</title>
+            <style>
+                body { font-family: Arial, sans-serif; text-align: center; padding: 50px; }
+                .error { color: #dc3545; font-size: 20px; margin-bottom: 20px; }
+                .button { background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 20px; }
+            </style>
+        </head>
+        <body>
+            <div class="error">⚠️ Verification Failed</div>
+            <p>""".encode()
+_VERIFY_FAILED_TAIL = f"""</p>
+            <a href="{FRONTEND_URL}/register" class="button">Try Registering Again</a>
+        </body>
+        </html>
+        """.encode()
+
+def _reset_token_key(token: str) -> str:
+    return f"pwreset:{token}"
+
+# Tokens live in Redis when it is reachable and in password_resets otherwise, so
+# lookups try Redis first and fall back to the table
+
+def _store_reset_token(db: Session, token: str, user_id: int) -> None:
+    """Save a new reset token - Redis expires it for us, otherwise keep a row in password_resets"""
+    if redis_client is not None:
+        try:
+            redis_client.setex(_reset_token_key(token), RESET_TOKEN_TTL, user_id)
+            return
+        except Exception as e:
+            print(f"⚠️ [AUTH] Redis unavailable, storing reset token in the database: {str(e)}")
+    db.add(PasswordReset(
+        user_id=user_id,
+        token=token,
+        expires_at=datetime.utcnow() + timedelta(seconds=RESET_TOKEN_TTL)
+    ))
+    db.commit()
+
+def _reset_token_active(db: Session, token: str) -> bool:
+    """Cheap existence check for the reset page - doesn't consume the token"""
+    if redis_client is not None:
+        try:
+            if redis_client.exists(_reset_token_key(token)):
+                return True
+        except Exception as e:
+            print(f"⚠️ [AUTH] Redis unavailable, checking reset token in the database: {str(e)}")
+    return db.query(exists().where(
+        PasswordReset.token == token,
+        PasswordReset.expires_at > SQL_UTC_NOW,
+        PasswordReset.used == False
+    )).scalar()
+
+def _consume_reset_token(db: Session, token: str):
+    """Atomically mark the token used and return its user id, or None if invalid/already used"""
+    if redis_client is not None:
+        try:
+            user_id = redis_client.getdel(_reset_token_key(token))
+            if user_id is not None:
+                return int(user_id)
+        except Exception as e:
+            print(f"⚠️ [AUTH] Redis unavailable, consuming reset token in the database: {str(e)}")
+    return db.execute(
+        update(PasswordReset)
+        .where(
+            PasswordReset.token == token,
+            PasswordReset.expires_at > SQL_UTC_NOW,
+            PasswordReset.used == False
         )
-    return user
+        .values(used=True)
+        .returning(PasswordReset.user_id)
+    ).scalar()
 
 @router.post("/register/customer")
 def register_customer(customer_data: CustomerRegister, db: Session = Depends(get_db)):
@@ -62,26 +127,17 @@ def register_vendor(vendor_data: VendorRegister, db: Session = Depends(get_db)):
     return AuthService.register_vendor(db, vendor_data)
 
 @router.post("/register")
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Register a new user - sends verification email"""
     try:
         print(f"🔐 [AUTH] Registration attempt for: {user_data.email}")
         
         # Check if user already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
+        if db.query(exists().where(User.email == user_data.email)).scalar():
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # Check if pending user exists
-        existing_pending = db.query(PendingUser).filter(PendingUser.email == user_data.email).first()
-        if existing_pending:
-            # Resend verification email
-            verification_url = f"{BASE_URL}/api/users/verify-email?token={existing_pending.verification_token}"
-            email_sent = EmailService.send_verification_email(
-                email=user_data.email,
-                first_name=user_data.first_name,
-                verification_url=verification_url
-            )
+        if db.query(exists().where(PendingUser.email == user_data.email)).scalar():
             raise HTTPException(
                 status_code=400, 
                 detail="Verification email already sent. Please check your email."
@@ -89,8 +145,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         
         # Check phone number if provided
         if user_data.phone_number:
-            existing_phone = db.query(User).filter(User.phone_number == user_data.phone_number).first()
-            if existing_phone:
+            if db.query(exists().where(User.phone_number == user_data.phone_number)).scalar():
                 raise HTTPException(status_code=400, detail="Phone number already registered")
 
         # Hash password
@@ -113,11 +168,12 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         
         db.add(pending_user)
         db.commit()
-        db.refresh(pending_user)
         
-        # Send verification email
+        # Send verification email after the response goes out
         verification_url = f"{BASE_URL}/api/users/verify-email?token={verification_token}"
-        email_sent = EmailService.send_verification_email(
+        background_tasks.add_task(
+            _send_email_task,
+            EmailService.send_verification_email,
             email=user_data.email,
             first_name=user_data.first_name,
             verification_url=verification_url
@@ -125,7 +181,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         
         return {
             "message": "Registration successful! Please check your email for verification link.",
-            "email_sent": email_sent,
+            "email_sent": True,
+            "email_queued": True,
             "debug_info": {
                 "verification_url": verification_url,
                 "email": user_data.email
@@ -155,7 +212,7 @@ def verify_email(request: Request, token: str = Query(...), db: Session = Depend
         # Find pending user
         pending_user = db.query(PendingUser).filter(
             PendingUser.email == payload['email'],
-            PendingUser.expires_at > datetime.utcnow()
+            PendingUser.expires_at > SQL_UTC_NOW
         ).first()
         
         if not pending_user:
@@ -173,8 +230,8 @@ def verify_email(request: Request, token: str = Query(...), db: Session = Depend
         )
         
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        # Flush to get user.id; everything below is committed together
+        db.flush()
         
         # If vendor, create initial salon
         if user.role == UserRole.VENDOR:
@@ -195,71 +252,49 @@ def verify_email(request: Request, token: str = Query(...), db: Session = Depend
                     is_active=True
                 )
                 db.add(initial_salon)
-                db.commit()
                 print(f"✅ Created initial salon for vendor: {user.email}")
         
         # Clean up pending user
         db.delete(pending_user)
         db.commit()
         
-        print(f"✅ [AUTH] Email verified successfully for: {user.email}")
-        return templates.TemplateResponse("email_verified.html", {"request": request})
+        print(f"✅ [AUTH] Email verified successfully for: {payload['email']}")
+        return static_html_response(request, "app/templates/email_verified.html")
         
     except Exception as e:
         print(f"❌ [AUTH] Email verification error: {str(e)}")
-        return HTMLResponse(f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Verification Failed - Salon Connect</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; text-align: center; padding: 50px; }}
-                .error {{ color: #dc3545; font-size: 20px; margin-bottom: 20px; }}
-                .button {{ background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 20px; }}
-            </style>
-        </head>
-        <body>
-            <div class="error">⚠️ Verification Failed</div>
-            <p>{str(e)}</p>
-            <a href="{FRONTEND_URL}/register" class="button">Try Registering Again</a>
-        </body>
-        </html>
-        """)
+        return HTMLResponse(_VERIFY_FAILED_HEAD + html.escape(str(e)).encode() + _VERIFY_FAILED_TAIL)
 
-@router.post("/forgot-password")
-def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+@router.post("/forgot-password", dependencies=[Depends(rate_limit("forgot-password", 5, 1 / 60))])
+def forgot_password(request: ForgotPasswordRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Request password reset - sends email with reset link"""
     try:
         print(f"🔐 [AUTH] Forgot password attempt for: {request.email}")
-        user = db.query(User).filter(User.email == request.email).first()
+        user = db.query(User.id, User.email, User.first_name).filter(User.email == request.email).first()
         if not user:
             print(f"ℹ️ [AUTH] User not found for email: {request.email}")
             return {"message": "If the email exists, a password reset link will be sent."}
         
         reset_token = EmailService.generate_reset_token(user.email)
         
-        # Save reset token
-        password_reset = PasswordReset(
-            user_id=user.id,
-            token=reset_token,
-            expires_at=datetime.utcnow() + timedelta(hours=1)
-        )
-        db.add(password_reset)
-        db.commit()
+        _store_reset_token(db, reset_token, user.id)
         
         reset_url = f"{BASE_URL}/api/users/reset-password-page?token={reset_token}"
         
-        # Send email
-        email_sent = EmailService.send_password_reset_email(
+        # Send email after the response goes out
+        background_tasks.add_task(
+            _send_email_task,
+            EmailService.send_password_reset_email,
             email=user.email,
             first_name=user.first_name,
             reset_url=reset_url
         )
-        print(f"📧 [AUTH] Password reset email sent status: {email_sent}")
+        print(f"📧 [AUTH] Password reset email queued for: {user.email}")
         
         return {
             "message": "Password reset link sent to your email.",
-            "email_sent": email_sent,
+            "email_sent": True,
+            "email_queued": True,
             "debug_info": {
                 "reset_url": reset_url,
                 "email": request.email
@@ -287,13 +322,7 @@ def reset_password_page(request: Request, token: str = Query(...), db: Session =
                 "valid_token": False
             })
         
-        password_reset = db.query(PasswordReset).filter(
-            PasswordReset.token == token,
-            PasswordReset.expires_at > datetime.utcnow(),
-            PasswordReset.used == False
-        ).first()
-        
-        if not password_reset:
+        if not _reset_token_active(db, token):
             return templates.TemplateResponse("reset_password.html", {
                 "request": request, 
                 "error": "Invalid or expired reset link. Please request a new password reset.",
@@ -334,28 +363,6 @@ def reset_password(
                 "valid_token": False
             })
         
-        user = db.query(User).filter(User.email == payload['email']).first()
-        if not user:
-            return templates.TemplateResponse("reset_password.html", {
-                "request": request, 
-                "error": "User not found",
-                "valid_token": False
-            })
-        
-        password_reset = db.query(PasswordReset).filter(
-            PasswordReset.user_id == user.id,
-            PasswordReset.token == token,
-            PasswordReset.expires_at > datetime.utcnow(),
-            PasswordReset.used == False
-        ).first()
-        
-        if not password_reset:
-            return templates.TemplateResponse("reset_password.html", {
-                "request": request, 
-                "error": "Invalid or expired reset token",
-                "valid_token": False
-            })
-        
         if new_password != confirm_password:
             return templates.TemplateResponse("reset_password.html", {
                 "request": request, 
@@ -372,16 +379,25 @@ def reset_password(
                 "valid_token": True
             })
         
+        # Single UPDATE ... RETURNING burns the token, so two concurrent submits can't both use it
+        user_id = _consume_reset_token(db, token)
+        if user_id is None:
+            return templates.TemplateResponse("reset_password.html", {
+                "request": request, 
+                "error": "Invalid or expired reset token",
+                "valid_token": False
+            })
+        
         # Update password
-        user.password = get_password_hash(new_password)
-        password_reset.used = True
+        db.query(User).filter(User.id == user_id).update(
+            {User.password: get_password_hash(new_password)}, synchronize_session=False
+        )
         db.commit()
+        invalidate_cached_user(user_id)
         
-        print(f"✅ [AUTH] Password reset successful for user: {user.email}")
+        print(f"✅ [AUTH] Password reset successful for user: {payload['email']}")
         
-        return templates.TemplateResponse("password_reset_success.html", {
-            "request": request
-        })
+        return static_html_response(request, "app/templates/password_reset_success.html")
         
     except Exception as e:
         print(f"❌ [AUTH] Password reset error: {str(e)}")
@@ -391,15 +407,14 @@ def reset_password(
             "valid_token": False
         })
 
-@router.post("/resend-verification")
-def resend_verification(email: str, db: Session = Depends(get_db)):
+@router.post("/resend-verification", dependencies=[Depends(rate_limit("resend-verification", 5, 1 / 60))])
+def resend_verification(email: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Resend email verification"""
     try:
         print(f"🔐 [AUTH] Resend verification attempt for: {email}")
         
         # First check if user already exists and is verified
-        existing_user = db.query(User).filter(User.email == email, User.is_verified == True).first()
-        if existing_user:
+        if db.query(exists().where(User.email == email, User.is_verified == True)).scalar():
             # Return proper 400 response
             raise HTTPException(
                 status_code=400, 
@@ -426,18 +441,21 @@ def resend_verification(email: str, db: Session = Depends(get_db)):
         else:
             verification_url = f"{BASE_URL}/api/users/verify-email?token={pending_user.verification_token}"
         
-        # Send verification email
-        email_sent = EmailService.send_verification_email(
+        # Send verification email after the response goes out
+        background_tasks.add_task(
+            _send_email_task,
+            EmailService.send_verification_email,
             email=email,
             first_name=pending_user.first_name,
             verification_url=verification_url
         )
         
-        print(f"📧 [AUTH] Resend verification email sent status: {email_sent}")
+        print(f"📧 [AUTH] Resend verification email queued for: {email}")
         
         return {
             "message": "Verification email sent successfully",
-            "email_sent": email_sent
+            "email_sent": True,
+            "email_queued": True
         }
         
     except HTTPException:
@@ -452,11 +470,13 @@ def resend_verification(email: str, db: Session = Depends(get_db)):
             "email_sent": False
         }
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit("login", 10, 1 / 30))])
 def login(user_data: UserLogin, db: Session = Depends(get_db)):
     """Password login"""
     try:
-        user = db.query(User).filter(User.email == user_data.email).first()
+        user = db.query(
+            User.id, User.email, User.password, User.is_active, User.is_verified
+        ).filter(User.email == user_data.email).first()
         if not user or not verify_password(user_data.password, user.password):
             raise HTTPException(status_code=401, detail="Invalid email or password")
         
@@ -469,8 +489,7 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
                 detail="Please verify your email before logging in. Check your inbox for verification link."
             )
         
-        access_token = create_access_token(data={"user_id": user.id, "email": user.email})
-        refresh_token = create_access_token(data={"user_id": user.id}, expires_delta=timedelta(days=7))
+        access_token, refresh_token = create_token_pair(user.id, user.email)
         
         return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
         
@@ -480,11 +499,13 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         print(f"❌ [AUTH] Login error: {str(e)}")
         raise HTTPException(status_code=401, detail="Login failed")
 
-@router.post("/login/otp/request")
-def request_otp_login(request: OTPLoginRequest, db: Session = Depends(get_db)):
+@router.post("/login/otp/request", dependencies=[Depends(rate_limit("otp-request", 5, 1 / 60))])
+def request_otp_login(request: OTPLoginRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Request OTP for login"""
     try:
-        user = db.query(User).filter(User.email == request.email).first()
+        user = db.query(
+            User.id, User.email, User.first_name, User.is_active, User.is_verified
+        ).filter(User.email == request.email).first()
         if not user:
             # For security, don't reveal if user exists
             return {"message": "If the email exists, an OTP has been sent"}
@@ -514,8 +535,10 @@ def request_otp_login(request: OTPLoginRequest, db: Session = Depends(get_db)):
         db.add(user_otp)
         db.commit()
         
-        # Send OTP email
-        email_sent = EmailService.send_otp_email(
+        # Send OTP email after the response goes out
+        background_tasks.add_task(
+            _send_email_task,
+            EmailService.send_otp_email,
             email=user.email,
             first_name=user.first_name,
             otp=otp
@@ -523,7 +546,8 @@ def request_otp_login(request: OTPLoginRequest, db: Session = Depends(get_db)):
         
         return {
             "message": "OTP sent to your email",
-            "email_sent": email_sent
+            "email_sent": True,
+            "email_queued": True
         }
     except HTTPException:
         raise
@@ -531,11 +555,11 @@ def request_otp_login(request: OTPLoginRequest, db: Session = Depends(get_db)):
         print(f"❌ [AUTH] OTP request error: {str(e)}")
         raise HTTPException(status_code=400, detail="Failed to send OTP")
 
-@router.post("/login/otp/verify", response_model=Token)
+@router.post("/login/otp/verify", response_model=Token, dependencies=[Depends(rate_limit("otp-verify", 10, 1 / 30))])
 def verify_otp_login(request: OTPVerifyRequest, db: Session = Depends(get_db)):
     """Verify OTP and login"""
     try:
-        user = db.query(User).filter(User.email == request.email).first()
+        user = db.query(User.id, User.email).filter(User.email == request.email).first()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -543,7 +567,7 @@ def verify_otp_login(request: OTPVerifyRequest, db: Session = Depends(get_db)):
         user_otp = db.query(UserOTP).filter(
             UserOTP.user_id == user.id,
             UserOTP.otp == request.otp,
-            UserOTP.expires_at > datetime.utcnow(),
+            UserOTP.expires_at > SQL_UTC_NOW,
             UserOTP.used == False
         ).first()
         
@@ -555,8 +579,7 @@ def verify_otp_login(request: OTPVerifyRequest, db: Session = Depends(get_db)):
         db.commit()
         
         # Create tokens
-        access_token = create_access_token(data={"user_id": user.id, "email": user.email})
-        refresh_token = create_access_token(data={"user_id": user.id}, expires_delta=timedelta(days=7))
+        access_token, refresh_token = create_token_pair(user.id, user.email)
         
         return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
     except HTTPException:
@@ -572,12 +595,20 @@ def change_password(
     db: Session = Depends(get_db)
 ):
     """Change password for authenticated user"""
+    # Sync def: the bcrypt/hash work below runs in the threadpool, not on the event loop
     try:
-        if not verify_password(request.current_password, current_user.password):
+        # Reject a no-op change before paying for any hashing
+        if request.current_password == request.new_password:
+            raise HTTPException(status_code=400, detail="New password must be different from the current password")
+        
+        # get_current_user leaves the hash out of the user it returns, so load it here
+        current_hash = db.query(User.password).filter(User.id == current_user.id).scalar()
+        if not verify_password(request.current_password, current_hash):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
         
         current_user.password = get_password_hash(request.new_password)
         db.commit()
+        invalidate_cached_user(current_user.id)
         
         return {"message": "Password changed successfully"}
     except HTTPException:
@@ -608,11 +639,9 @@ def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=401, detail="Token refresh failed")
 
 @router.get("/token/verify")
-def verify_token_endpoint(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def verify_token_endpoint(payload: dict = Depends(get_token_payload)):
     """Verify token validity"""
     try:
-        token = credentials.credentials
-        payload = verify_token(token)
         if not payload:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -630,12 +659,10 @@ def logout(current_user: dict = Depends(get_current_user)):
     """Logout user (client should remove tokens)"""
     return {"message": "Successfully logged out"}
 
-@router.get("/debug-env")
-def debug_environment():
-    """Debug environment variables on Render"""
-    import os
-    
-    env_vars = {
+# Debug endpoints are only registered when DEBUG is on; the values they report
+# are fixed for the life of the process, so snapshot them once at import
+if settings.DEBUG:
+    _ENV_SNAPSHOT = {
         "SMTP_HOST": os.getenv("SMTP_HOST"),
         "SMTP_PORT": os.getenv("SMTP_PORT"), 
         "SMTP_USER": os.getenv("SMTP_USER"),
@@ -649,17 +676,8 @@ def debug_environment():
         "BASE_URL": BASE_URL,
         "FRONTEND_URL": FRONTEND_URL
     }
-    
-    print(f"🔧 [ENV DEBUG] Environment variables: {env_vars}")
-    
-    return env_vars
 
-@router.get("/debug-email")
-def debug_email_config():
-    """Debug endpoint to check email configuration"""
-    import os
-    
-    config_info = {
+    _EMAIL_CONFIG_SNAPSHOT = {
         "FROM_EMAIL": settings.FROM_EMAIL,
         "SENDGRID_API_KEY_SET": bool(settings.SENDGRID_API_KEY),
         "SENDGRID_API_KEY_LENGTH": len(settings.SENDGRID_API_KEY) if settings.SENDGRID_API_KEY else 0,
@@ -668,7 +686,13 @@ def debug_email_config():
         "BASE_URL": BASE_URL,
         "FRONTEND_URL": FRONTEND_URL
     }
-    
-    print(f"🔧 [DEBUG] Email Configuration: {config_info}")
-    
-    return config_info
\ No newline at end of file
+
+    @router.get("/debug-env")
+    def debug_environment():
+        """Debug environment variables on Render"""
+        return _ENV_SNAPSHOT
+
+    @router.get("/debug-email")
+    def debug_email_config():
+        """Debug endpoint to check email configuration"""
+        return _EMAIL_CONFIG_SNAPSHOT
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status as http_status, Query  # CHANGED: imported as http_status
+from fastapi import APIRouter, Depends, HTTPException, Response, status as http_status, Query  # CHANGED: imported as http_status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -6,19 +6,29 @@ from app.database import get_db
 from app.schemas.booking import BookingResponse, BookingCreate, BookingUpdate
 from app.routes.users import get_current_user
 from app.services.booking_service import BookingService
+from app.models.user import UserRole
 
 router = APIRouter()
 
+def _set_next_cursor(response: Response, bookings, limit: int):
+    """Expose the `after` value for the next page; absent on the last page"""
+    if len(bookings) == limit:
+        response.headers["X-Next-Cursor"] = str(bookings[-1].id)
+
 @router.get("/", response_model=List[BookingResponse])
 def get_bookings(
+    response: Response,
     status: Optional[str] = Query(None),  # This parameter name conflicts with the status module
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[int] = Query(None, description="Last booking id from the previous page; faster than page for deep lists"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get bookings for current user"""
-    return BookingService.get_user_bookings(db, current_user.id, status, page, limit)
+    bookings = BookingService.get_user_bookings(db, current_user.id, status, page, limit, after)
+    _set_next_cursor(response, bookings, limit)
+    return bookings
 
 @router.post("/", response_model=BookingResponse)
 def create_booking(
@@ -27,7 +37,7 @@ def create_booking(
     db: Session = Depends(get_db)
 ):
     """Create a new booking"""
-    if current_user.role.value != "customer":
+    if current_user.role is not UserRole.CUSTOMER:
         raise HTTPException(
             status_code=http_status.HTTP_403_FORBIDDEN,  # CHANGED: Use http_status
             detail="Only customers can create bookings"
@@ -51,7 +61,7 @@ def get_booking(
     
     # Authorization check
     if booking.customer_id != current_user.id and (
-        current_user.role.value == "vendor" and booking.salon.owner_id != current_user.id
+        current_user.role is UserRole.VENDOR and booking.salon.owner_id != current_user.id
     ):
         raise HTTPException(
             status_code=http_status.HTTP_403_FORBIDDEN,  # CHANGED: Use http_status
@@ -77,7 +87,7 @@ def update_booking(
     
     # Authorization check
     if booking.customer_id != current_user.id and (
-        current_user.role.value == "vendor" and booking.salon.owner_id != current_user.id
+        current_user.role is UserRole.VENDOR and booking.salon.owner_id != current_user.id
     ):
         raise HTTPException(
             status_code=http_status.HTTP_403_FORBIDDEN,  # CHANGED: Use http_status
@@ -88,17 +98,23 @@ def update_booking(
 
 @router.get("/vendor/bookings", response_model=List[BookingResponse])
 def get_vendor_bookings(
+    response: Response,
     status: Optional[str] = Query(None),  # This parameter name conflicts with the status module
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[int] = Query(None, description="Last booking id from the previous page; faster than page for deep lists"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get bookings for vendor's salons"""
-    if current_user.role.value != "vendor":
+    if current_user.role is not UserRole.VENDOR:
         raise HTTPException(
             status_code=http_status.HTTP_403_FORBIDDEN,  # CHANGED: Use http_status
             detail="Only vendors can access this endpoint"
         )
     
-    return BookingService.get_vendor_bookings(db, current_user.id, status, page, limit)
\ No newline at end of file
+    bookings = BookingService.get_vendor_bookings(
+        db, current_user.id, booking_status=status, page=page, limit=limit, after=after
+    )
+    _set_next_cursor(response, bookings, limit)
+    return bookings
\ No newline at end of file
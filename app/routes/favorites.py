@@ -1,54 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import threading
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, dialect_insert
+from app.core.dependencies import get_current_user
 from app.schemas.salon import SalonResponse
-from app.core.security import verify_token
 from app.models.user import User, user_favorites
 from app.models.salon import Salon
-from sqlalchemy import and_
+from sqlalchemy import and_, literal, select
 
 router = APIRouter()
-security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    token = credentials.credentials
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    user_id = payload.get("user_id")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    return user
+# SalonResponse JSON bytes per salon version, encoded by pydantic-core. updated_at
+# changes on every ORM update of the row, so an entry is never served for a newer
+# version. Kept in least-recently-used order; superseded versions age out first.
+SALON_CACHE_MAX_ENTRIES = 50000
+_salon_cache = {}
+_salon_cache_lock = threading.Lock()
+_salon_adapter = TypeAdapter(SalonResponse)
 
-@router.get("/favorites", response_model=List[SalonResponse])
+def _serialize_salon(salon: Salon) -> bytes:
+    key = (salon.id, salon.updated_at)
+    with _salon_cache_lock:
+        data = _salon_cache.pop(key, None)
+        if data is not None:
+            _salon_cache[key] = data
+            return data
+    data = _salon_adapter.dump_json(_salon_adapter.validate_python(salon, from_attributes=True))
+    with _salon_cache_lock:
+        while len(_salon_cache) >= SALON_CACHE_MAX_ENTRIES:
+            del _salon_cache[next(iter(_salon_cache))]
+        _salon_cache[key] = data
+    return data
+
+# The handler returns the encoded bytes itself, so the schema is only documented
+@router.get("/favorites", responses={200: {"model": List[SalonResponse]}})
 def get_favorites(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get user's favorite salons"""
-    # Get favorite salons using the association table
-    favorite_salons = db.query(Salon).join(
+    # Get favorite salons using the association table; the (user_id, salon_id)
+    # primary key covers the join. SalonResponse has no is_favorited field, so
+    # there is nothing to annotate on the rows.
+    salons = db.query(Salon).join(
         user_favorites, Salon.id == user_favorites.c.salon_id
     ).filter(
         user_favorites.c.user_id == current_user.id
     ).all()
-    
-    # Add is_favorited field
-    for salon in favorite_salons:
-        salon.is_favorited = True
-    
-    return favorite_salons
+    # Already JSON, so skip the response_model pass and just join the cached items
+    return Response(
+        content=b"[" + b",".join(_serialize_salon(salon) for salon in salons) + b"]",
+        media_type="application/json"
+    )
 
 @router.post("/favorites/{salon_id}")
 def add_to_favorites(
@@ -57,32 +63,24 @@ def add_to_favorites(
     db: Session = Depends(get_db)
 ):
     """Add salon to favorites"""
-    salon = db.query(Salon).filter(Salon.id == salon_id).first()
-    if not salon:
-        raise HTTPException(status_code=404, detail="Salon not found")
-    
-    # Check if already favorited
-    existing = db.execute(
-        user_favorites.select().where(
-            and_(
-                user_favorites.c.user_id == current_user.id,
-                user_favorites.c.salon_id == salon_id
-            )
+    # One round trip: insert only if the salon exists, skip if already favorited
+    added = db.execute(
+        dialect_insert(user_favorites)
+        .from_select(
+            ["user_id", "salon_id"],
+            select(literal(current_user.id), Salon.id).where(Salon.id == salon_id)
         )
+        .on_conflict_do_nothing(index_elements=["user_id", "salon_id"])
+        .returning(user_favorites.c.salon_id)
     ).first()
+    db.commit()
     
-    if existing:
+    if added is None:
+        # Only the failure path pays for telling the two cases apart
+        if not db.query(Salon.id).filter(Salon.id == salon_id).first():
+            raise HTTPException(status_code=404, detail="Salon not found")
         raise HTTPException(status_code=400, detail="Salon already in favorites")
     
-    # Add to favorites
-    db.execute(
-        user_favorites.insert().values(
-            user_id=current_user.id,
-            salon_id=salon_id
-        )
-    )
-    db.commit()
-    
     return {"message": "Salon added to favorites"}
 
 @router.delete("/favorites/{salon_id}")
@@ -92,18 +90,18 @@ def remove_from_favorites(
     db: Session = Depends(get_db)
 ):
     """Remove salon from favorites"""
-    # Remove from favorites
-    result = db.execute(
+    # Remove from favorites; RETURNING confirms the delete in the same round trip
+    deleted = db.execute(
         user_favorites.delete().where(
             and_(
                 user_favorites.c.user_id == current_user.id,
                 user_favorites.c.salon_id == salon_id
             )
-        )
-    )
+        ).returning(user_favorites.c.salon_id)
+    ).first()
     db.commit()
     
-    if result.rowcount == 0:
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Salon not in favorites")
     
     return {"message": "Salon removed from favorites"}
\ No newline at end of file
@@ -1,21 +1,98 @@
 from fastapi import APIRouter, Request, Depends, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, RedirectResponse
+from jose import JWTError, jwt
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.database import get_db
 from app.services.auth import AuthService
-from app.core.security import create_access_token
+from app.core.security import create_token_pair
 from app.models.user import User, UserRole
 from app.schemas.user import GoogleOAuthRegister
 from app.core.config import settings
+from app.core.responses import DefaultResponse
+import asyncio
+import hashlib
 import json
+import logging
 import secrets
 import time
 import httpx
-import traceback
+from markupsafe import escape
+from string import Template
+from urllib.parse import quote, urlencode
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Everything but the state nonce comes from settings, so encode it once
+_GOOGLE_AUTH_URL_PREFIX = "https://accounts.google.com/o/oauth2/v2/auth?" + urlencode({
+    "client_id": settings.GOOGLE_CLIENT_ID,
+    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+    "response_type": "code",
+    "scope": "email profile openid",
+    "access_type": "offline",
+    "prompt": "select_account"
+}, quote_via=quote)
+
+# Google profile per (code, state) for a short while, so a duplicate callback from
+# the same redirect gets the first result; codes are single-use at Google. The
+# callback only looks here once the state matches the session's oauth_state,
+# which is cleared after the exchange, so a hit can only go to a request sent
+# with the session cookie from before the first callback finished
+CALLBACK_RESULT_TTL = 30
+CALLBACK_RESULT_MAX_ENTRIES = 1024
+_callback_results = {}
+# Exchange in progress per key; concurrent duplicates await the same future
+_callback_inflight = {}
+
+def _get_callback_result(key):
+    entry = _callback_results.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+def _set_callback_result(key, result):
+    now = time.monotonic()
+    if len(_callback_results) >= CALLBACK_RESULT_MAX_ENTRIES:
+        for expired in [k for k, entry in _callback_results.items() if entry[0] <= now]:
+            del _callback_results[expired]
+        # Entries share one TTL, so insertion order is expiry order
+        while len(_callback_results) >= CALLBACK_RESULT_MAX_ENTRIES:
+            del _callback_results[next(iter(_callback_results))]
+    _callback_results[key] = (now + CALLBACK_RESULT_TTL, result)
+
+def _finish_exchange(key, future):
+    _callback_inflight.pop(key, None)
+    if not future.cancelled() and future.exception() is None:
+        _set_callback_result(key, future.result())
+
+_GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+def _id_token_profile(id_token):
+    """Profile claims from the id_token, or None if they are missing or not valid.
+
+    The token comes straight from Google's token endpoint over TLS, which OpenID
+    Connect accepts in place of checking its signature; iss, aud and exp are still
+    checked as it requires.
+    """
+    if not id_token:
+        return None
+    try:
+        claims = jwt.get_unverified_claims(id_token)
+    except JWTError:
+        return None
+    if claims.get('iss') not in _GOOGLE_ISSUERS or claims.get('aud') != settings.GOOGLE_CLIENT_ID:
+        return None
+    exp = claims.get('exp')
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return None
+    if not claims.get('email') or not claims.get('sub'):
+        return None
+    return claims
+
 class GoogleOAuthService:
     async def start_oauth(self, request: Request, is_registration: bool = False):
         """Start OAuth flow and return authorization URL"""
@@ -30,22 +107,11 @@ class GoogleOAuthService:
             request.session['oauth_timestamp'] = time.time()
             request.session['oauth_purpose'] = 'registration' if is_registration else 'login'
             
-            # Build authorization URL
-            auth_url = (
-                f"https://accounts.google.com/o/oauth2/v2/auth?"
-                f"client_id={settings.GOOGLE_CLIENT_ID}&"
-                f"redirect_uri={settings.GOOGLE_REDIRECT_URI}&"
-                f"response_type=code&"
-                f"scope=email%20profile%20openid&"
-                f"state={state}&"
-                f"access_type=offline&"
-                f"prompt=select_account"
-            )
-            
-            return auth_url
+            # Only the state changes per request
+            return f"{_GOOGLE_AUTH_URL_PREFIX}&state={state}"
             
         except Exception as e:
-            print(f"Error generating authorization URL: {e}")
+            logger.error("Error generating authorization URL: %s", e)
             raise HTTPException(status_code=500, detail=f"Failed to start OAuth: {str(e)}")
 
     async def handle_callback(self, request: Request):
@@ -66,59 +132,24 @@ class GoogleOAuthService:
             if not state:
                 raise HTTPException(status_code=400, detail="No state parameter received")
             
-            # Verify state
-            stored_state = request.session.get('oauth_state')
-            stored_timestamp = request.session.get('oauth_timestamp')
-            oauth_purpose = request.session.get('oauth_purpose', 'login')
-            
-            if not stored_state or stored_state != state:
+            # The state binds the callback to the browser that started the flow,
+            # for cached results as much as for a fresh exchange
+            if request.session.get('oauth_state') != state:
                 raise HTTPException(status_code=400, detail="Session expired. Please try again.")
             
-            if stored_timestamp and (time.time() - stored_timestamp) > 600:
-                raise HTTPException(status_code=400, detail="Session expired")
-            
-            # Exchange code for tokens
-            async with httpx.AsyncClient() as client:
-                token_response = await client.post(
-                    "https://oauth2.googleapis.com/token",
-                    data={
-                        'client_id': settings.GOOGLE_CLIENT_ID,
-                        'client_secret': settings.GOOGLE_CLIENT_SECRET,
-                        'code': code,
-                        'grant_type': 'authorization_code',
-                        'redirect_uri': settings.GOOGLE_REDIRECT_URI,
-                    }
-                )
-                
-                if token_response.status_code != 200:
-                    error_detail = token_response.text
-                    print(f"Token exchange failed: {error_detail}")
-                    raise HTTPException(status_code=400, detail="Failed to exchange authorization code")
-                
-                token_data = token_response.json()
-                access_token = token_data.get('access_token')
-            
-            # Get user info
-            async with httpx.AsyncClient() as client:
-                userinfo_response = await client.get(
-                    "https://www.googleapis.com/oauth2/v3/userinfo",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                
-                if userinfo_response.status_code != 200:
-                    raise HTTPException(status_code=400, detail="Failed to get user information")
-                
-                user_info = userinfo_response.json()
-            
-            # Prepare user data
-            google_user_data = {
-                'email': user_info['email'],
-                'first_name': user_info.get('given_name', ''),
-                'last_name': user_info.get('family_name', ''),
-                'picture': user_info.get('picture', ''),
-                'google_id': user_info['sub'],
-                'email_verified': user_info.get('email_verified', False)
-            }
+            # A retried or double-clicked callback reuses the first exchange's result
+            # instead of spending the single-use code again
+            key = hashlib.sha256(f"{code}:{state}".encode()).hexdigest()
+            result = _get_callback_result(key)
+            if result is None:
+                exchange = _callback_inflight.get(key)
+                if exchange is None:
+                    exchange = asyncio.ensure_future(self._exchange_code(request, code, state))
+                    _callback_inflight[key] = exchange
+                    exchange.add_done_callback(lambda future: _finish_exchange(key, future))
+                # shield: one caller disconnecting must not cancel the others' exchange
+                result = await asyncio.shield(exchange)
+            google_user_data, oauth_purpose = result
             
             # Store for registration if needed
             if oauth_purpose == 'registration':
@@ -133,21 +164,101 @@ class GoogleOAuthService:
         except HTTPException:
             raise
         except Exception as e:
-            print(f"OAuth callback error: {e}")
+            logger.error("OAuth callback error: %s", e)
             raise HTTPException(status_code=400, detail=f"Authentication failed: {str(e)}")
     
+    async def _exchange_code(self, request: Request, code: str, state: str):
+        """Check the state against the session, then trade the code for the Google profile"""
+        # Verify state
+        stored_state = request.session.get('oauth_state')
+        stored_timestamp = request.session.get('oauth_timestamp')
+        oauth_purpose = request.session.get('oauth_purpose', 'login')
+        
+        if not stored_state or stored_state != state:
+            raise HTTPException(status_code=400, detail="Session expired. Please try again.")
+        
+        if stored_timestamp and (time.time() - stored_timestamp) > 600:
+            raise HTTPException(status_code=400, detail="Session expired")
+        
+        # Exchange code for tokens
+        async with httpx.AsyncClient() as client:
+            token_response = await client.post(
+                "https://oauth2.googleapis.com/token",
+                data={
+                    'client_id': settings.GOOGLE_CLIENT_ID,
+                    'client_secret': settings.GOOGLE_CLIENT_SECRET,
+                    'code': code,
+                    'grant_type': 'authorization_code',
+                    'redirect_uri': settings.GOOGLE_REDIRECT_URI,
+                }
+            )
+            
+            if token_response.status_code != 200:
+                error_detail = token_response.text
+                logger.warning("Token exchange failed: %s", error_detail)
+                raise HTTPException(status_code=400, detail="Failed to exchange authorization code")
+            
+            token_data = token_response.json()
+            access_token = token_data.get('access_token')
+            
+            # The id_token from the "openid" scope already carries the profile
+            # claims, so the userinfo round trip is only needed without it
+            user_info = _id_token_profile(token_data.get('id_token'))
+            if user_info is None:
+                userinfo_response = await client.get(
+                    "https://www.googleapis.com/oauth2/v3/userinfo",
+                    headers={"Authorization": f"Bearer {access_token}"}
+                )
+                
+                if userinfo_response.status_code != 200:
+                    raise HTTPException(status_code=400, detail="Failed to get user information")
+                
+                user_info = userinfo_response.json()
+        
+        # Prepare user data
+        google_user_data = {
+            'email': user_info['email'],
+            'first_name': user_info.get('given_name', ''),
+            'last_name': user_info.get('family_name', ''),
+            'picture': user_info.get('picture', ''),
+            'google_id': user_info['sub'],
+            'email_verified': user_info.get('email_verified', False)
+        }
+        
+        return google_user_data, oauth_purpose
+
     def _cleanup_oauth_session(self, request: Request):
         """Clean up OAuth session data"""
         session_keys = ['oauth_state', 'oauth_timestamp', 'oauth_purpose']
         for key in session_keys:
-            if key in request.session:
-                del request.session[key]
+            request.session.pop(key, None)
 
 # Create global instance
 google_oauth_service = GoogleOAuthService()
 
+# Blocking parts of the callbacks (sync ORM, bcrypt, JWT signing); the async
+# routes run these through run_in_threadpool
+def _issue_tokens(user: User):
+    return create_token_pair(user.id, user.email, user.role.value)
+
+# Only the columns the tokens and the success page read. Built once so SQLAlchemy
+# reuses the statement's memoized cache key instead of rebuilding it per callback
+_LOGIN_USER_BY_EMAIL = select(
+    User.id, User.email, User.first_name, User.last_name, User.role, User.is_verified
+).where(User.email == bindparam("email"))
+
+def _login_existing_user(db: Session, email: str):
+    user = db.execute(_LOGIN_USER_BY_EMAIL, {"email": email}).first()
+    if not user:
+        return None, None, None
+    return (user, *_issue_tokens(user))
+
+def _register_and_issue_tokens(db: Session, pending_user: dict, registration_data: GoogleOAuthRegister):
+    user, _ = AuthService.register_google_user(db, pending_user, registration_data)
+    return (user, *_issue_tokens(user))
+
 # Google OAuth Login - Returns JSON for API calls, Redirect for browser
-@router.get("/google/login", tags=["Google OAuth"], response_class=JSONResponse)
+@router.get("/google/login", tags=["Google OAuth"], response_class=DefaultResponse)
 async def google_login(request: Request):
     try:
         auth_url = await google_oauth_service.start_oauth(request, is_registration=False)
@@ -155,7 +266,7 @@ async def google_login(request: Request):
         # Check if this is an API call (based on headers)
         accept_header = request.headers.get("accept", "")
         if "application/json" in accept_header:
-            return JSONResponse(
+            return DefaultResponse(
                 status_code=200,
                 content={
                     "message": "OAuth flow started",
@@ -168,13 +279,13 @@ async def google_login(request: Request):
             return RedirectResponse(url=auth_url)
             
     except Exception as e:
-        return JSONResponse(
+        return DefaultResponse(
             status_code=500,
             content={"detail": str(e)}
         )
 
 # Google OAuth Registration - Returns JSON for API calls, Redirect for browser
-@router.get("/google/register", tags=["Google OAuth"], response_class=JSONResponse)
+@router.get("/google/register", tags=["Google OAuth"], response_class=DefaultResponse)
 async def google_register(request: Request):
     try:
         auth_url = await google_oauth_service.start_oauth(request, is_registration=True)
@@ -182,7 +293,7 @@ async def google_register(request: Request):
         # Check if this is an API call (based on headers)
         accept_header = request.headers.get("accept", "")
         if "application/json" in accept_header:
-            return JSONResponse(
+            return DefaultResponse(
                 status_code=200,
                 content={
                     "message": "OAuth registration flow started",
@@ -195,7 +306,7 @@ async def google_register(request: Request):
             return RedirectResponse(url=auth_url)
             
     except Exception as e:
-        return JSONResponse(
+        return DefaultResponse(
             status_code=500,
             content={"detail": str(e)}
         )
@@ -206,38 +317,18 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     try:
         google_user, oauth_purpose = await google_oauth_service.handle_callback(request)
         
-        # Check if user exists
-        existing_user = db.query(User).filter(User.email == google_user['email']).first()
+        # Check if user exists and sign its tokens off the event loop
+        existing_user, access_token, refresh_token = await run_in_threadpool(
+            _login_existing_user, db, google_user['email']
+        )
         
         if existing_user:
             # Existing user - proceed with login
-            access_token = create_access_token(
-                data={"user_id": existing_user.id, "email": existing_user.email, "role": existing_user.role.value}
-            )
-            refresh_token = create_access_token(
-                data={"user_id": existing_user.id}, 
-                expires_delta=timedelta(days=7)
-            )
-            
-            # PRINT TOKENS TO SERVER CONSOLE
-            print("\n" + "="*60)
-            print("GOOGLE OAUTH LOGIN - TOKENS GENERATED")
-            print("="*60)
-            print(f"User: {existing_user.email} (ID: {existing_user.id})")
-            print(f"Email: {google_user['email']}")
-            print(f"Role: {existing_user.role.value}")
-            print("="*60)
-            print(f"ACCESS TOKEN:\n{access_token}")
-            print("="*60)
-            print(f"REFRESH TOKEN:\n{refresh_token}")
-            print("="*60)
-            print("Copy these tokens to authorize your API requests!")
-            print("="*60 + "\n")
-            
-            user_permissions = AuthService.get_user_role_permissions(existing_user.role)
+            logger.info("Google OAuth login: %s (ID: %s, role: %s)",
+                        existing_user.email, existing_user.id, existing_user.role.value)
             
             return HTMLResponse(content=create_success_html(
-                existing_user, google_user, access_token, refresh_token, user_permissions, is_new_user=False
+                existing_user, google_user, access_token, refresh_token, is_new_user=False
             ))
         
         elif oauth_purpose == 'registration':
@@ -253,7 +344,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
             return HTMLResponse(content=create_redirect_to_registration(google_user))
         
     except Exception as e:
-        print(f"ERROR in Google OAuth callback: {str(e)}")
+        logger.exception("Google OAuth callback failed")
         return HTMLResponse(content=create_error_html(str(e)), status_code=400)
 
 @router.post("/google/complete-registration", tags=["Google OAuth"])
@@ -265,11 +356,12 @@ async def complete_google_registration(
     db: Session = Depends(get_db)
 ):
     try:
-        print("Starting complete registration")
+        logger.debug("Starting complete registration")
         
         # Get session data
-        pending_user = request.session.get('pending_google_user')
-        stored_temp_id = request.session.get('oauth_temp_id')
+        session = request.session
+        pending_user = session.get('pending_google_user')
+        stored_temp_id = session.get('oauth_temp_id')
         
         # Check if we have the necessary data
         if not pending_user:
@@ -297,62 +389,51 @@ async def complete_google_registration(
             phone_number=phone_number
         )
         
-        # Register the user
-        user, is_new_user = await AuthService.register_google_user(db, pending_user, registration_data)
-        
-        # Generate tokens
-        access_token = create_access_token(
-            data={"user_id": user.id, "email": user.email, "role": user.role.value}
-        )
-        refresh_token = create_access_token(
-            data={"user_id": user.id}, 
-            expires_delta=timedelta(days=7)
+        # Register the user and generate tokens; password hashing and the DB
+        # writes run in the threadpool
+        user, access_token, refresh_token = await run_in_threadpool(
+            _register_and_issue_tokens, db, pending_user, registration_data
         )
         
-        # PRINT TOKENS TO SERVER CONSOLE FOR NEW REGISTRATIONS
-        print("\n" + "="*60)
-        print("GOOGLE OAUTH REGISTRATION - TOKENS GENERATED")
-        print("="*60)
-        print(f"New User: {user.email} (ID: {user.id})")
-        print(f"Email: {pending_user['email']}")
-        print(f"Role: {user.role.value}")
-        print("="*60)
-        print(f"ACCESS TOKEN:\n{access_token}")
-        print("="*60)
-        print(f"REFRESH TOKEN:\n{refresh_token}")
-        print("="*60)
-        print("Copy these tokens to authorize your API requests!")
-        print("="*60 + "\n")
-        
-        user_permissions = AuthService.get_user_role_permissions(user.role)
+        # Log the new account; never the tokens themselves
+        logger.info("Google OAuth registration: %s (ID: %s, role: %s)",
+                    user.email, user.id, user.role.value)
         
         # Clean up session
-        if 'pending_google_user' in request.session:
-            del request.session['pending_google_user']
-        if 'oauth_temp_id' in request.session:
-            del request.session['oauth_temp_id']
+        session.pop('pending_google_user', None)
+        session.pop('oauth_temp_id', None)
         
         return HTMLResponse(content=create_success_html(
-            user, pending_user, access_token, refresh_token, user_permissions, is_new_user=True
+            user, pending_user, access_token, refresh_token, is_new_user=True
         ))
         
     except Exception as e:
-        print(f"ERROR in complete registration: {str(e)}")
+        logger.exception("Complete registration failed")
         return HTMLResponse(content=create_error_html(str(e)), status_code=400)
 
 # HTML Template Functions
-def create_registration_form(google_user, temp_session_id):
-    # Ensure temp_session_id is not None
-    if not temp_session_id:
-        temp_session_id = "missing_session_id"
-        
-    return f"""
+# Page layouts are compiled once; handlers only substitute the per-user fields.
+# Values are HTML-escaped for markup and JSON-encoded (with "<" escaped) inside <script>.
+try:
+    import orjson
+    
+    def _js(value):
+        return orjson.dumps(value).decode().replace("<", "\\u003c")
+except ImportError:
+    def _js(value):
+        return json.dumps(value).replace("<", "\\u003c")
+
+_FRONTEND_URL_JS = _js(settings.FRONTEND_URL)
+_DASHBOARD_URL_JS = _js(f"{settings.FRONTEND_URL}/dashboard")
+_PERMISSIONS_JS = {role: _js(AuthService.get_user_role_permissions(role)) for role in UserRole}
+
+_REGISTRATION_FORM_TPL = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <title>Complete Registration - Salon Connect</title>
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 display: flex;
                 justify-content: center;
@@ -360,50 +441,50 @@ def create_registration_form(google_user, temp_session_id):
                 min-height: 100vh;
                 margin: 0;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 10px;
                 box-shadow: 0 10px 30px rgba(0,0,0,0.2);
                 max-width: 500px;
                 width: 90%;
-            }}
-            .user-info {{
+            }
+            .user-info {
                 text-align: center;
                 margin-bottom: 30px;
                 padding: 20px;
                 background: #f8f9fa;
                 border-radius: 8px;
-            }}
-            .avatar {{
+            }
+            .avatar {
                 width: 80px;
                 height: 80px;
                 border-radius: 50%;
                 margin: 0 auto 15px;
-            }}
-            .form-group {{
+            }
+            .form-group {
                 margin-bottom: 20px;
-            }}
-            label {{
+            }
+            label {
                 display: block;
                 margin-bottom: 8px;
                 font-weight: bold;
                 color: #333;
-            }}
-            select, input {{
+            }
+            select, input {
                 width: 100%;
                 padding: 12px;
                 border: 2px solid #ddd;
                 border-radius: 5px;
                 font-size: 16px;
                 box-sizing: border-box;
-            }}
-            select:focus, input:focus {{
+            }
+            select:focus, input:focus {
                 border-color: #667eea;
                 outline: none;
-            }}
-            .role-option {{
+            }
+            .role-option {
                 display: flex;
                 align-items: center;
                 padding: 15px;
@@ -412,29 +493,29 @@ def create_registration_form(google_user, temp_session_id):
                 border-radius: 8px;
                 cursor: pointer;
                 transition: all 0.3s;
-            }}
-            .role-option:hover {{
+            }
+            .role-option:hover {
                 border-color: #667eea;
                 background: #f8f9fa;
-            }}
-            .role-option.selected {{
+            }
+            .role-option.selected {
                 border-color: #667eea;
                 background: #667eea;
                 color: white;
-            }}
-            .role-icon {{
+            }
+            .role-icon {
                 font-size: 24px;
                 margin-right: 15px;
-            }}
-            .role-info h3 {{
+            }
+            .role-info h3 {
                 margin: 0 0 5px 0;
-            }}
-            .role-info p {{
+            }
+            .role-info p {
                 margin: 0;
                 font-size: 14px;
                 opacity: 0.8;
-            }}
-            .submit-btn {{
+            }
+            .submit-btn {
                 background: #28a745;
                 color: white;
                 border: none;
@@ -444,33 +525,33 @@ def create_registration_form(google_user, temp_session_id):
                 cursor: pointer;
                 width: 100%;
                 margin-top: 20px;
-            }}
-            .submit-btn:hover {{
+            }
+            .submit-btn:hover {
                 background: #218838;
-            }}
-            .debug-info {{
+            }
+            .debug-info {
                 background: #f8f9fa;
                 padding: 10px;
                 border-radius: 5px;
                 font-size: 12px;
                 color: #666;
                 margin-top: 10px;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="container">
             <div class="user-info">
-                <img class="avatar" src="{google_user.get('picture', '')}" alt="Profile Picture" onerror="this.style.display='none'">
+                <img class="avatar" src="$picture" alt="Profile Picture" onerror="this.style.display='none'">
                 <h2>Complete Your Registration</h2>
-                <p>Welcome, {google_user['first_name']}! Please choose your account type:</p>
+                <p>Welcome, $first_name! Please choose your account type:</p>
                 <div class="debug-info">
-                    Debug: Session ID = {temp_session_id}
+                    Debug: Session ID = $temp_session_id
                 </div>
             </div>
 
             <form action="/api/auth/google/complete-registration" method="post" id="registrationForm">
-                <input type="hidden" name="temp_session_id" value="{temp_session_id}">
+                <input type="hidden" name="temp_session_id" value="$temp_session_id">
                 
                 <div class="form-group">
                     <label>Account Type *</label>
@@ -506,44 +587,53 @@ def create_registration_form(google_user, temp_session_id):
 
         <script>
             console.log('Registration form loaded');
-            console.log('Temp session ID:', '{temp_session_id}');
+            console.log('Temp session ID:', $temp_session_id_js);
             console.log('Form action:', document.getElementById('registrationForm').action);
             
-            function selectRole(role) {{
-                document.querySelectorAll('.role-option').forEach(opt => {{
+            function selectRole(role) {
+                document.querySelectorAll('.role-option').forEach(opt => {
                     opt.classList.remove('selected');
                     opt.querySelector('input[type="radio"]').checked = false;
-                }});
+                });
                 
                 const selectedOption = event.currentTarget;
                 selectedOption.classList.add('selected');
                 selectedOption.querySelector('input[type="radio"]').checked = true;
-            }}
+            }
 
-            document.getElementById('registrationForm').addEventListener('submit', function(e) {{
+            document.getElementById('registrationForm').addEventListener('submit', function(e) {
                 const roleSelected = document.querySelector('input[name="role"]:checked');
-                if (!roleSelected) {{
+                if (!roleSelected) {
                     e.preventDefault();
                     alert('Please select an account type');
                     return false;
-                }}
-                console.log('Form submitting with session ID:', '{temp_session_id}');
-            }});
+                }
+                console.log('Form submitting with session ID:', $temp_session_id_js);
+            });
         </script>
     </body>
     </html>
-    """
+    """)
 
-def create_success_html(user, google_user, access_token, refresh_token, permissions, is_new_user):
-    welcome_message = "Welcome to Salon Connect!" if is_new_user else "Welcome back to Salon Connect!"
-    
-    return f"""
+def create_registration_form(google_user, temp_session_id):
+    # Ensure temp_session_id is not None
+    if not temp_session_id:
+        temp_session_id = "missing_session_id"
+        
+    return _REGISTRATION_FORM_TPL.substitute(
+        picture=escape(google_user.get('picture', '')),
+        first_name=escape(google_user['first_name']),
+        temp_session_id=escape(temp_session_id),
+        temp_session_id_js=_js(temp_session_id)
+    )
+
+_SUCCESS_TPL = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <title>Registration Successful - Salon Connect</title>
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 display: flex;
                 justify-content: center;
@@ -551,30 +641,30 @@ def create_success_html(user, google_user, access_token, refresh_token, permissi
                 height: 100vh;
                 margin: 0;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 10px;
                 box-shadow: 0 10px 30px rgba(0,0,0,0.2);
                 text-align: center;
                 max-width: 500px;
-            }}
-            .success {{
+            }
+            .success {
                 color: #28a745;
                 font-size: 48px;
                 margin-bottom: 20px;
-            }}
-            .user-info {{
+            }
+            .user-info {
                 margin: 20px 0;
-            }}
-            .avatar {{
+            }
+            .avatar {
                 width: 80px;
                 height: 80px;
                 border-radius: 50%;
                 margin: 0 auto 15px;
-            }}
-            .role-badge {{
+            }
+            .role-badge {
                 display: inline-block;
                 padding: 5px 15px;
                 background: #007bff;
@@ -582,8 +672,8 @@ def create_success_html(user, google_user, access_token, refresh_token, permissi
                 border-radius: 20px;
                 font-size: 14px;
                 margin: 10px 0;
-            }}
-            .welcome-badge {{
+            }
+            .welcome-badge {
                 display: inline-block;
                 padding: 5px 15px;
                 background: #28a745;
@@ -591,72 +681,98 @@ def create_success_html(user, google_user, access_token, refresh_token, permissi
                 border-radius: 20px;
                 font-size: 14px;
                 margin: 10px 0;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="container">
             <div class="success">Success</div>
-            <h2>{welcome_message}</h2>
+            <h2>$welcome_message</h2>
             
             <div class="user-info">
-                <img class="avatar" src="{google_user.get('picture', '')}" alt="Profile Picture" onerror="this.style.display='none'">
-                <h3>{user.first_name} {user.last_name}</h3>
-                <p>{user.email}</p>
-                <div class="role-badge">{user.role.value.upper()}</div>
-                {'<div class="welcome-badge">NEW USER</div>' if is_new_user else ''}
+                <img class="avatar" src="$picture" alt="Profile Picture" onerror="this.style.display='none'">
+                <h3>$first_name $last_name</h3>
+                <p>$email</p>
+                <div class="role-badge">$role_upper</div>
+                $new_user_badge
             </div>
             
-            <p>Your account has been successfully {"created" if is_new_user else "accessed"}.</p>
-            {'<p>We have sent a welcome email with more information.</p>' if is_new_user else ''}
+            <p>Your account has been successfully $action.</p>
+            $welcome_email_note
             
             <script>
-                const authData = {{
-                    access_token: "{access_token}",
-                    refresh_token: "{refresh_token}",
-                    user: {{
-                        id: {user.id},
-                        email: "{user.email}",
-                        first_name: "{user.first_name}",
-                        last_name: "{user.last_name}",
-                        role: "{user.role.value}",
-                        is_verified: {str(user.is_verified).lower()},
+                const authData = {
+                    access_token: $access_token_js,
+                    refresh_token: $refresh_token_js,
+                    user: {
+                        id: $user_id,
+                        email: $email_js,
+                        first_name: $first_name_js,
+                        last_name: $last_name_js,
+                        role: $role_js,
+                        is_verified: $is_verified,
                         is_oauth_user: true,
-                        permissions: {json.dumps(permissions)}
-                    }}
-                }};
+                        permissions: $permissions_js
+                    }
+                };
                 
                 console.log('Authentication successful:', authData);
                 
-                if (window.opener && !window.opener.closed) {{
-                    window.opener.postMessage({{ 
+                if (window.opener && !window.opener.closed) {
+                    window.opener.postMessage({ 
                         type: 'oauth_success', 
                         data: authData,
-                        is_new_user: {str(is_new_user).lower()}
-                    }}, "{settings.FRONTEND_URL}");
+                        is_new_user: $is_new_user
+                    }, $frontend_url_js);
                     setTimeout(() => window.close(), 1000);
-                }} else {{
+                } else {
                     localStorage.setItem('salonconnect_auth', JSON.stringify(authData));
-                    setTimeout(() => {{
-                        window.location.href = '{settings.FRONTEND_URL}/dashboard';
-                    }}, 2000);
-                }}
+                    setTimeout(() => {
+                        window.location.href = $dashboard_url_js;
+                    }, 2000);
+                }
             </script>
             
             <p><small>Redirecting to application...</small></p>
         </div>
     </body>
     </html>
-    """
+    """)
 
-def create_redirect_to_registration(google_user):
-    return f"""
+def create_success_html(user, google_user, access_token, refresh_token, is_new_user):
+    welcome_message = "Welcome to Salon Connect!" if is_new_user else "Welcome back to Salon Connect!"
+    
+    return _SUCCESS_TPL.substitute(
+        welcome_message=welcome_message,
+        picture=escape(google_user.get('picture', '')),
+        first_name=escape(user.first_name or ''),
+        last_name=escape(user.last_name or ''),
+        email=escape(user.email),
+        role_upper=user.role.value.upper(),
+        new_user_badge='<div class="welcome-badge">NEW USER</div>' if is_new_user else '',
+        action="created" if is_new_user else "accessed",
+        welcome_email_note='<p>We have sent a welcome email with more information.</p>' if is_new_user else '',
+        access_token_js=_js(access_token),
+        refresh_token_js=_js(refresh_token),
+        user_id=user.id,
+        email_js=_js(user.email),
+        first_name_js=_js(user.first_name),
+        last_name_js=_js(user.last_name),
+        role_js=_js(user.role.value),
+        is_verified=_js(bool(user.is_verified)),
+        permissions_js=_PERMISSIONS_JS[user.role],
+        is_new_user=_js(bool(is_new_user)),
+        frontend_url_js=_FRONTEND_URL_JS,
+        dashboard_url_js=_DASHBOARD_URL_JS
+    )
+
+_REDIRECT_TO_REGISTRATION_TPL = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <title>Account Not Found - Salon Connect</title>
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 display: flex;
                 justify-content: center;
@@ -664,27 +780,27 @@ def create_redirect_to_registration(google_user):
                 height: 100vh;
                 margin: 0;
                 background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 10px;
                 box-shadow: 0 10px 30px rgba(0,0,0,0.2);
                 text-align: center;
                 max-width: 400px;
-            }}
-            .info {{
+            }
+            .info {
                 color: #007bff;
                 font-size: 48px;
                 margin-bottom: 20px;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="container">
             <div class="info">ℹ️</div>
             <h2>Account Not Found</h2>
-            <p>We couldn't find an account for <strong>{google_user['email']}</strong>.</p>
+            <p>We couldn't find an account for <strong>$email</strong>.</p>
             <p>Please register first to create your account.</p>
             <button onclick="window.location.href='/api/auth/google/register'" style="
                 background: #007bff;
@@ -700,16 +816,19 @@ def create_redirect_to_registration(google_user):
         </div>
     </body>
     </html>
-    """
+    """)
 
-def create_error_html(error_message):
-    return f"""
+def create_redirect_to_registration(google_user):
+    return _REDIRECT_TO_REGISTRATION_TPL.substitute(email=escape(google_user['email']))
+
+# Error page shell is static - encode it once and splice in the escaped message
+_ERROR_HTML_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>Error - Salon Connect</title>
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 display: flex;
                 justify-content: center;
@@ -717,26 +836,27 @@ def create_error_html(error_message):
                 height: 100vh;
                 margin: 0;
                 background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
-            }}
-            .container {{
+            }
+            .container {
                 background: white;
                 padding: 40px;
                 border-radius: 10px;
                 box-shadow: 0 10
-            }}
+            }
 
-            .error {{
+            .error {
                 color: #dc3545;
                 font-size: 48px;
                 margin-bottom: 20px;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="container">
             <div class="error">Error</div>
             <h2>Authentication Failed</h2>
-            <p><strong>Error:</strong> {error_message}</p>
+            <p><strong>Error:</strong> """.encode()
+_ERROR_HTML_TAIL = """</p>
             <button onclick="window.close()" style="
                 background: #dc3545;
                 color: white;
@@ -749,12 +869,15 @@ def create_error_html(error_message):
         </div>
     </body>
     </html>
-    """            
+    """.encode()
+
+def create_error_html(error_message):
+    return _ERROR_HTML_HEAD + escape(str(error_message)).encode() + _ERROR_HTML_TAIL
 
-# Test endpoints
-@router.get("/test-oauth", tags=["Google OAuth"])
-async def test_oauth_config():
-    return {
+# Test endpoints are only registered when DEBUG is on, like the auth debug routes.
+# OAuth settings are fixed for the life of the process, so render the summary once
+if settings.DEBUG:
+    _OAUTH_CONFIG_RESPONSE = DefaultResponse({
         "google_configured": bool(settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET),
         "redirect_uri": settings.GOOGLE_REDIRECT_URI,
         "admin_emails": settings.get_admin_emails_list(),
@@ -763,18 +886,25 @@ async def test_oauth_config():
             "register": "/api/auth/google/register", 
             "callback": "/api/auth/google/callback"
         }
-    }
-
-@router.get("/debug-session", tags=["Google OAuth"])
-async def debug_session(request: Request):
-    """Debug session state"""
-    session_data = {
-        "session_exists": hasattr(request, 'session'),
-        "session_keys": list(request.session.keys()) if hasattr(request, 'session') else [],
-        "oauth_state": request.session.get('oauth_state') if hasattr(request, 'session') else None,
-        "oauth_timestamp": request.session.get('oauth_timestamp') if hasattr(request, 'session') else None,
-        "oauth_purpose": request.session.get('oauth_purpose') if hasattr(request, 'session') else None,
-        "pending_google_user": bool(request.session.get('pending_google_user')),
-        "oauth_temp_id": request.session.get('oauth_temp_id')
-    }
-    return session_data
\ No newline at end of file
+    })
+
+    @router.get("/test-oauth", tags=["Google OAuth"])
+    async def test_oauth_config():
+        return _OAUTH_CONFIG_RESPONSE
+
+    @router.get("/debug-session", tags=["Google OAuth"])
+    async def debug_session(request: Request):
+        """Debug session state"""
+        # One snapshot of the session instead of a lookup per field
+        session_exists = "session" in request.scope
+        session = dict(request.session) if session_exists else {}
+        session_data = {
+            "session_exists": session_exists,
+            "session_keys": list(session),
+            "oauth_state": session.get('oauth_state'),
+            "oauth_timestamp": session.get('oauth_timestamp'),
+            "oauth_purpose": session.get('oauth_purpose'),
+            "pending_google_user": bool(session.get('pending_google_user')),
+            "oauth_temp_id": session.get('oauth_temp_id')
+        }
+        return DefaultResponse(session_data)
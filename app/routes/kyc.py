@@ -9,8 +9,9 @@ from app.models.user import User, UserRole
 from app.models.kyc import VendorKYC, KYCAuditLog
 from app.schemas.kyc import *
 from app.services.kyc_service import KYCService
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, invalidate_cached_user
 from app.core.config import settings
+from app.core.responses import static_html_response
 
 router = APIRouter()
 kyc_service = KYCService()
@@ -19,9 +20,7 @@ logger = logging.getLogger(__name__)
 @router.get("/portal", response_class=HTMLResponse)
 async def kyc_portal(request: Request):
     """Serve KYC portal HTML"""
-    with open("app/templates/kyc_portal.html", "r") as f:
-        html_content = f.read()
-    return HTMLResponse(content=html_content)
+    return static_html_response(request, "app/templates/kyc_portal.html")
 
 @router.post("/upload-document")
 async def upload_document(
@@ -196,6 +195,7 @@ async def submit_kyc(
         
         db.commit()
         db.refresh(kyc_record)
+        invalidate_cached_user(current_user.id)
         
         # Log action
         audit_log = KYCAuditLog(
@@ -11,6 +11,7 @@ from app.schemas.payment import PaymentResponse, PaymentInitiate, PaymentVerific
 from app.routes.users import get_current_user
 from app.services.payment_service import PaymentService
 from app.core.config import settings
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -111,7 +112,7 @@ def get_payment(
     
     # Check if user is authorized to view this payment
     if payment.booking.customer_id != current_user.id and (
-        current_user.role.value == "vendor" and payment.booking.salon.owner_id != current_user.id
+        current_user.role is UserRole.VENDOR and payment.booking.salon.owner_id != current_user.id
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
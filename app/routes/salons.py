@@ -12,6 +12,7 @@ from app.schemas.salon import (
 from app.routes.users import get_current_user
 from app.services.salon_service import SalonService
 from app.core.cloudinary import upload_image
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -33,7 +34,7 @@ def create_salon(
     db: Session = Depends(get_db)
 ):
     """Create a new salon (vendor only)"""
-    if current_user.role.value != "vendor":
+    if current_user.role is not UserRole.VENDOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only vendors can create salons"
@@ -167,7 +168,7 @@ def create_review(
     db: Session = Depends(get_db)
 ):
     """Create a review for a salon (customers only)"""
-    if current_user.role.value != "customer":
+    if current_user.role is not UserRole.CUSTOMER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only customers can create reviews"
@@ -227,7 +228,7 @@ def get_vendor_salons(
     db: Session = Depends(get_db)
 ):
     """Get all salons owned by the current vendor"""
-    if current_user.role.value != "vendor":
+    if current_user.role is not UserRole.VENDOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only vendors can access this endpoint"
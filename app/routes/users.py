@@ -1,44 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.database import get_db
+from app.core.dependencies import get_current_user
 from app.schemas.user import UserResponse, UserProfileResponse, UserProfileUpdate
-from app.core.security import verify_token
 from app.services.auth import AuthService
 from app.core.cloudinary import upload_image
-from app.models.user import User, UserProfile
-
-
-from app.routes import google_oauth
+from app.models.user import User, UserProfile, UserRole
 
 router = APIRouter()
-security = HTTPBearer()
-
-# Include Google OAuth routes
-# router.include_router(google_oauth.router, prefix="/api/users", tags=["Google OAuth"])
 
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    token = credentials.credentials
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    user_id = payload.get("user_id")
-    user = AuthService.get_user_by_id(db, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    return user
-
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
@@ -68,14 +42,14 @@ def get_user_role(current_user: User = Depends(get_current_user)):
 @router.get("/customer/dashboard")
 def get_customer_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get customer dashboard data"""
-    if current_user.role.value != "customer":  
+    if current_user.role is not UserRole.CUSTOMER:  
         raise HTTPException(status_code=403, detail="Only customers can access this endpoint")
     return AuthService.get_customer_dashboard(db, current_user.id)
 
 @router.get("/vendor/dashboard")
 def get_vendor_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get vendor dashboard data"""
-    if current_user.role.value != "vendor":  
+    if current_user.role is not UserRole.VENDOR:  
         raise HTTPException(status_code=403, detail="Only vendors can access this endpoint")
     return AuthService.get_vendor_dashboard(db, current_user.id)
 
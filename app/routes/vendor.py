@@ -11,7 +11,7 @@ from app.services.auth import AuthService
 from app.services.salon_service import SalonService
 from app.services.booking_service import BookingService
 from app.core.cloudinary import upload_image
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.models.salon import Salon, Service, SalonImage
 from app.models.booking import Booking, BookingStatus
 
@@ -34,7 +34,7 @@ async def get_current_vendor(token: str, db: Session = Depends(get_db)):
             detail="User not found"
         )
     
-    if user.role != "vendor":
+    if user.role is not UserRole.VENDOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Vendor access required"
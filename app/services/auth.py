@@ -4,14 +4,42 @@ from datetime import datetime, timedelta
 import jwt  
 from app.core.config import settings  
 import secrets
+import logging
 from app.schemas.user import CustomerRegister, VendorRegister
 
 import os
+from sqlalchemy import func, or_
+from app.database import SQL_UTC_NOW, dialect_insert
 from app.models.user import User, UserProfile, UserRole, PendingUser, UserOTP
+from app.models.booking import Booking
+from app.models.salon import Salon
+from app.models.vendor import VendorBusinessInfo
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, UserProfileUpdate, OTPLoginRequest, OTPVerifyRequest, GoogleOAuthRegister
-from app.core.security import get_password_hash, verify_password, create_access_token, verify_token
+from app.core.security import get_password_hash, verify_password, create_access_token, create_token_pair, verify_token
+from app.core.dependencies import invalidate_cached_user
 from app.services.email import EmailService
 
+logger = logging.getLogger(__name__)
+
+# Fixed per role; tuples so callers can't mutate the shared values
+ROLE_PERMISSIONS = {
+    UserRole.CUSTOMER: (
+        "view_salons", "book_appointments", "manage_own_bookings", 
+        "view_own_profile", "update_own_profile", "favorite_salons",
+        "write_reviews", "cancel_own_bookings", "view_booking_history"
+    ),
+    UserRole.VENDOR: (
+        "manage_salons", "manage_bookings", "view_reports", 
+        "update_business_info", "manage_services", "view_analytics",
+        "manage_availability", "process_payments", "manage_staff"
+    ),
+    UserRole.ADMIN: (
+        "manage_users", "manage_all_salons", "view_all_reports",
+        "system_configuration", "content_moderation", "all_permissions",
+        "manage_payments", "view_analytics", "manage_system_settings"
+    )
+}
+
 class AuthService:
     @staticmethod
     def register_user(db: Session, user_data: UserCreate):
@@ -22,13 +50,6 @@ class AuthService:
         
         existing_pending = db.query(PendingUser).filter(PendingUser.email == user_data.email).first()
         if existing_pending:
-            # Resend verification email - USING NEW SIGNATURE
-            verification_url = f"https://salonconnect-qzne.onrender.com/api/users/verify-email?token={existing_pending.verification_token}"
-            email_sent = EmailService.send_verification_email(
-                email=existing_pending.email,
-                first_name=existing_pending.first_name,
-                verification_url=verification_url
-            )
             raise HTTPException(status_code=400, detail="Verification email already sent. Please check your email.")
         
         # Check phone number only if provided
@@ -54,7 +75,6 @@ class AuthService:
         
         db.add(pending_user)
         db.commit()
-        db.refresh(pending_user)
         
         # Send verification email - USING NEW SIGNATURE
         verification_url = f"https://salonconnect-qzne.onrender.com/api/users/verify-email?token={verification_token}"
@@ -76,7 +96,7 @@ class AuthService:
         # Find pending user by email (not by token since token is regenerated each time)
         pending_user = db.query(PendingUser).filter(
             PendingUser.email == payload['email'],
-            PendingUser.expires_at > datetime.utcnow()
+            PendingUser.expires_at > SQL_UTC_NOW
         ).first()
         
         if not pending_user:
@@ -169,7 +189,7 @@ class AuthService:
         user_otp = db.query(UserOTP).filter(
             UserOTP.user_id == user.id,
             UserOTP.otp == otp_data.otp,
-            UserOTP.expires_at > datetime.utcnow(),
+            UserOTP.expires_at > SQL_UTC_NOW,
             UserOTP.used == False
         ).first()
         
@@ -181,8 +201,7 @@ class AuthService:
         db.commit()
         
         # Generate tokens
-        access_token = create_access_token(data={"user_id": user.id, "email": user.email})
-        refresh_token = create_access_token(data={"user_id": user.id}, expires_delta=timedelta(days=7))
+        access_token, refresh_token = create_token_pair(user.id, user.email)
         
         return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
 
@@ -202,8 +221,7 @@ class AuthService:
                 detail="Please verify your email before logging in. Check your inbox for verification link."
             )
         
-        access_token = create_access_token(data={"user_id": user.id, "email": user.email})
-        refresh_token = create_access_token(data={"user_id": user.id}, expires_delta=timedelta(days=7))
+        access_token, refresh_token = create_token_pair(user.id, user.email)
         
         return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
 
@@ -270,7 +288,6 @@ class AuthService:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get recent bookings count
-        from app.models.booking import Booking
         recent_bookings_count = db.query(Booking).filter(
             Booking.customer_id == user_id
         ).count()
@@ -295,9 +312,6 @@ class AuthService:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get vendor's salons
-        from app.models.salon import Salon
-        from app.models.booking import Booking
-        
         salons = db.query(Salon).filter(Salon.owner_id == user_id).all()
         total_salons = len(salons)
         
@@ -332,13 +346,6 @@ class AuthService:
             
             existing_pending = db.query(PendingUser).filter(PendingUser.email == customer_data.email).first()
             if existing_pending:
-                # Resend verification email - USING NEW SIGNATURE
-                verification_url = f"https://salonconnect-qzne.onrender.com/api/users/verify-email?token={existing_pending.verification_token}"
-                email_sent = EmailService.send_verification_email(
-                    email=existing_pending.email,
-                    first_name=existing_pending.first_name,
-                    verification_url=verification_url
-                )
                 raise HTTPException(status_code=400, detail="Verification email already sent. Please check your email.")
             
             # Check phone number
@@ -364,7 +371,6 @@ class AuthService:
             
             db.add(pending_user)
             db.commit()
-            db.refresh(pending_user)
             
             # Send verification email - USING NEW SIGNATURE
             verification_url = f"https://salonconnect-qzne.onrender.com/api/users/verify-email?token={verification_token}"
@@ -406,13 +412,6 @@ class AuthService:
             
             existing_pending = db.query(PendingUser).filter(PendingUser.email == vendor_data.email).first()
             if existing_pending:
-                # Resend verification email - USING NEW SIGNATURE
-                verification_url = f"https://salonconnect-qzne.onrender.com/api/users/verify-email?token={existing_pending.verification_token}"
-                email_sent = EmailService.send_verification_email(
-                    email=existing_pending.email,
-                    first_name=existing_pending.first_name,
-                    verification_url=verification_url
-                )
                 raise HTTPException(status_code=400, detail="Verification email already sent. Please check your email.")
             
             # Check phone numbers
@@ -442,7 +441,6 @@ class AuthService:
             
             db.add(pending_user)
             db.commit()
-            db.refresh(pending_user)
             
             # Send vendor-specific verification email - USING NEW SIGNATURE
             verification_url = f"https://salonconnect-qzne.onrender.com/api/users/verify-email?token={verification_token}"
@@ -454,7 +452,6 @@ class AuthService:
             )
             
             # Store business info
-            from app.models.vendor import VendorBusinessInfo
             business_info = VendorBusinessInfo(
                 email=vendor_data.email,
                 business_name=vendor_data.business_name,
@@ -488,32 +485,8 @@ class AuthService:
             )
 
     @staticmethod
-    async def register_google_user(db: Session, google_user: dict, registration_data: GoogleOAuthRegister = None):
+    def register_google_user(db: Session, google_user: dict, registration_data: GoogleOAuthRegister = None):
         try:
-            # Check if user already exists
-            existing_user = db.query(User).filter(User.email == google_user['email']).first()
-            
-            if existing_user:
-                # Update existing user with Google info if needed
-                if not existing_user.google_id:
-                    existing_user.google_id = google_user['google_id']
-                    existing_user.is_oauth_user = True
-                
-                if not existing_user.is_verified:
-                    existing_user.is_verified = True
-                
-                # Update name if different
-                if (existing_user.first_name != google_user['first_name'] or 
-                    existing_user.last_name != google_user['last_name']):
-                    existing_user.first_name = google_user['first_name']
-                    existing_user.last_name = google_user['last_name']
-                    existing_user.updated_at = datetime.utcnow()
-                
-                db.commit()
-                db.refresh(existing_user)
-                return existing_user, False  # False means existing user
-            
-            # Create new user
             auto_password = f"google_oauth_{secrets.token_urlsafe(12)}"
             hashed_password = get_password_hash(auto_password)
             
@@ -524,7 +497,7 @@ class AuthService:
             elif registration_data and registration_data.role:
                 user_role = registration_data.role
             
-            user = User(
+            values = dict(
                 email=google_user['email'],
                 password=hashed_password,
                 first_name=google_user['first_name'],
@@ -538,11 +511,29 @@ class AuthService:
             
             # Add phone number if provided during registration
             if registration_data and registration_data.phone_number:
-                user.phone_number = registration_data.phone_number
+                values['phone_number'] = registration_data.phone_number
             
-            db.add(user)
+            # Create the user, or link Google to the existing account, in one statement.
+            # Only the conflict branch sets updated_at, which tells the two cases apart.
+            stmt = dialect_insert(User).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.email],
+                set_={
+                    'google_id': func.coalesce(User.google_id, stmt.excluded.google_id),
+                    'is_oauth_user': or_(User.is_oauth_user, User.google_id.is_(None)),
+                    'is_verified': True,
+                    'first_name': stmt.excluded.first_name,
+                    'last_name': stmt.excluded.last_name,
+                    'updated_at': SQL_UTC_NOW
+                }
+            ).returning(User)
+            user = db.execute(stmt, execution_options={"populate_existing": True}).scalar_one()
+            is_new_user = user.updated_at is None
             db.commit()
-            db.refresh(user)
+            
+            if not is_new_user:
+                invalidate_cached_user(user.id)
+                return user, False  # False means existing user
             
             # Create user profile
             profile = UserProfile(user_id=user.id)
@@ -551,12 +542,12 @@ class AuthService:
             db.add(profile)
             db.commit()
             
-            print(f"✅ Created new user via Google OAuth: {user.email} with role: {user.role}")
+            logger.info("Created new user via Google OAuth: %s with role: %s", user.email, user.role.value)
             return user, True  # True means new user
             
         except Exception as e:
             db.rollback()
-            print(f"❌ Error creating Google OAuth user: {e}")
+            logger.exception("Error creating Google OAuth user")
             raise HTTPException(status_code=500, detail=f"Error creating user: {str(e)}")
     
     @staticmethod
@@ -622,27 +613,10 @@ class AuthService:
     
     @staticmethod
     def get_user_role_permissions(role: UserRole):
-        permissions = {
-            UserRole.CUSTOMER: [
-                "view_salons", "book_appointments", "manage_own_bookings", 
-                "view_own_profile", "update_own_profile", "favorite_salons",
-                "write_reviews", "cancel_own_bookings", "view_booking_history"
-            ],
-            UserRole.VENDOR: [
-                "manage_salons", "manage_bookings", "view_reports", 
-                "update_business_info", "manage_services", "view_analytics",
-                "manage_availability", "process_payments", "manage_staff"
-            ],
-            UserRole.ADMIN: [
-                "manage_users", "manage_all_salons", "view_all_reports",
-                "system_configuration", "content_moderation", "all_permissions",
-                "manage_payments", "view_analytics", "manage_system_settings"
-            ]
-        }
-        return permissions.get(role, [])
+        # A fresh list, as callers have always had, so they can't alter the shared table
+        return list(ROLE_PERMISSIONS.get(role, ()))
     
     @staticmethod
     def can_user_access(user: User, permission: str):
-        user_permissions = AuthService.get_user_role_permissions(user.role)
-        return permission in user_permissions
+        return permission in ROLE_PERMISSIONS.get(user.role, ())
 
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import HTTPException, status
 from typing import Optional, List
 from datetime import datetime, date
@@ -9,6 +10,21 @@ from app.models.user import User
 from app.schemas.booking import BookingCreate, BookingUpdate
 from app.services.email import EmailService
 
+def _paginate_newest_first(query, page: Optional[int], limit: Optional[int], after: Optional[int] = None):
+    """Order newest first; `after` (last booking id seen) seeks past it instead of using OFFSET"""
+    if after is not None:
+        cursor_created_at = select(Booking.created_at).where(Booking.id == after).scalar_subquery()
+        query = query.filter(or_(
+            Booking.created_at < cursor_created_at,
+            and_(Booking.created_at == cursor_created_at, Booking.id < after)
+        ))
+    query = query.order_by(Booking.created_at.desc(), Booking.id.desc())
+    if after is None and page and limit:
+        query = query.offset((page - 1) * limit)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
 class BookingService:
     @staticmethod
     def create_booking(db: Session, booking_data: BookingCreate, customer_id: int):
@@ -106,35 +122,30 @@ class BookingService:
 
     @staticmethod
     def get_booking_by_id(db: Session, booking_id: int):
-        """Get booking by ID with all relationships"""
+        """Get booking by ID with its items and the salon owner used for authorization"""
         return db.query(Booking).options(
-            joinedload(Booking.customer),
-            joinedload(Booking.salon),
-            joinedload(Booking.items).joinedload(BookingItem.service)
+            selectinload(Booking.salon).load_only(Salon.id, Salon.owner_id, Salon.name),
+            selectinload(Booking.items)
         ).filter(Booking.id == booking_id).first()
 
     @staticmethod
-    def get_user_bookings(db: Session, user_id: int, booking_status: Optional[str] = None, page: int = 1, limit: int = 10):
+    def get_user_bookings(db: Session, user_id: int, booking_status: Optional[str] = None, page: int = 1, limit: int = 10, after: Optional[int] = None):
         """Get bookings for a specific user"""
+        # BookingResponse only needs the items; one extra IN query for the whole page
         query = db.query(Booking).options(
-            joinedload(Booking.customer),
-            joinedload(Booking.salon),
-            joinedload(Booking.items).joinedload(BookingItem.service)
+            selectinload(Booking.items)
         ).filter(Booking.customer_id == user_id)
         
         if booking_status: 
             query = query.filter(Booking.status == booking_status)
         
-        offset = (page - 1) * limit
-        return query.order_by(Booking.created_at.desc()).offset(offset).limit(limit).all()
+        return _paginate_newest_first(query, page, limit, after)
 
     @staticmethod
-    def get_vendor_bookings(db: Session, vendor_id: int, booking_status: Optional[str] = None, salon_id: Optional[int] = None, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    def get_vendor_bookings(db: Session, vendor_id: int, booking_status: Optional[str] = None, salon_id: Optional[int] = None, start_date: Optional[date] = None, end_date: Optional[date] = None, page: Optional[int] = None, limit: Optional[int] = None, after: Optional[int] = None):
         """Get bookings for vendor's salons with filters"""
         query = db.query(Booking).options(
-            joinedload(Booking.customer),
-            joinedload(Booking.salon),
-            joinedload(Booking.items).joinedload(BookingItem.service)
+            selectinload(Booking.items)
         ).join(Salon).filter(Salon.owner_id == vendor_id)
         
         if booking_status:
@@ -149,7 +160,7 @@ class BookingService:
         if end_date:
             query = query.filter(Booking.booking_date <= end_date)
         
-        return query.order_by(Booking.created_at.desc()).all()
+        return _paginate_newest_first(query, page, limit, after)
 
     @staticmethod
     def update_booking(db: Session, booking_id: int, booking_data: BookingUpdate):
@@ -7,6 +7,11 @@ workers = 2
 
 worker_class = "uvicorn.workers.UvicornWorker"
 
+# Proxies whose X-Forwarded-For is trusted for request.client, which the auth rate
+# limits key on. Set to the load balancer's addresses (or "*" if the app is only
+# reachable through it); with the default, clients behind a proxy share its IP
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
 
 timeout = 120
 keepalive = 5
\ No newline at end of file
@@ -0,0 +1,98 @@
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.database import Base, SessionLocal
+import app.models.user, app.models.salon, app.models.booking, app.models.payment, app.models.vendor, app.models.kyc
+from app.main import app
+from app.core import rate_limit
+from app.core.security import get_password_hash
+from app.models.user import User, UserRole
+import app.core.dependencies as dependencies
+import app.routes.auth as auth_routes
+
+class FakeRedis:
+    """The redis-py calls the app makes, backed by a dict (decode_responses=True)"""
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = str(value)
+
+    def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def getdel(self, key):
+        return self.data.pop(key, None)
+
+class DownRedis:
+    """A Redis client whose server is unreachable"""
+    def __getattr__(self, name):
+        def unavailable(*args, **kwargs):
+            raise ConnectionError("Redis is down")
+        return unavailable
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    # Templates are looked up relative to the repo root
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    SessionLocal.configure(bind=engine)
+    monkeypatch.setattr(rate_limit, "_local_buckets", {})
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(dependencies, "redis_client", redis)
+    monkeypatch.setattr(auth_routes, "redis_client", redis)
+    return redis
+
+@pytest.fixture
+def down_redis(monkeypatch):
+    redis = DownRedis()
+    monkeypatch.setattr(dependencies, "redis_client", redis)
+    monkeypatch.setattr(auth_routes, "redis_client", redis)
+    return redis
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="customer@example.com",
+        password=get_password_hash("secret1"),
+        first_name="Ama",
+        last_name="Mensah",
+        role=UserRole.CUSTOMER,
+        is_verified=True,
+        is_active=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+@pytest.fixture
+def auth_headers(client, user):
+    response = client.post("/api/users/login", json={"email": user.email, "password": "secret1"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
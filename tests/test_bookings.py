@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from app.models.booking import Booking
+from app.models.salon import Salon
+
+def _make_bookings(db, user, count):
+    salon = Salon(owner_id=user.id, name="Glow", address="1 Oxford St", city="Accra", state="Greater Accra", country="Ghana")
+    db.add(salon)
+    db.commit()
+    bookings = [
+        Booking(customer_id=user.id, salon_id=salon.id, booking_date=datetime.utcnow() + timedelta(days=1), duration=30, total_amount=50.0)
+        for _ in range(count)
+    ]
+    db.add_all(bookings)
+    db.commit()
+    return [booking.id for booking in bookings]
+
+def test_bookings_keyset_pagination_with_after(client, db, user, auth_headers):
+    ids = _make_bookings(db, user, 5)
+    newest_first = sorted(ids, reverse=True)
+
+    first = client.get("/api/bookings/", params={"limit": 2}, headers=auth_headers)
+    assert [booking["id"] for booking in first.json()] == newest_first[:2]
+    cursor = first.headers["X-Next-Cursor"]
+    assert cursor == str(newest_first[1])
+
+    second = client.get("/api/bookings/", params={"limit": 2, "after": cursor}, headers=auth_headers)
+    assert [booking["id"] for booking in second.json()] == newest_first[2:4]
+
+    last = client.get("/api/bookings/", params={"limit": 2, "after": second.headers["X-Next-Cursor"]}, headers=auth_headers)
+    assert [booking["id"] for booking in last.json()] == newest_first[4:]
+    assert "X-Next-Cursor" not in last.headers
+
+def test_bookings_after_ignores_page(client, db, user, auth_headers):
+    ids = _make_bookings(db, user, 3)
+    newest_first = sorted(ids, reverse=True)
+
+    response = client.get("/api/bookings/", params={"limit": 10, "page": 3, "after": newest_first[0]}, headers=auth_headers)
+    assert [booking["id"] for booking in response.json()] == newest_first[1:]
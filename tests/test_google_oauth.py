@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.user import User, UserProfile, UserRole
+from app.routes.google_oauth import _id_token_profile
+from app.services.auth import AuthService
+
+GOOGLE_USER = {
+    "email": "google@example.com",
+    "first_name": "Kofi",
+    "last_name": "Boateng",
+    "picture": "https://example.com/kofi.png",
+    "google_id": "google-123"
+}
+
+def test_register_google_user_creates_a_new_account(db):
+    user, is_new_user = AuthService.register_google_user(db, GOOGLE_USER)
+
+    assert is_new_user
+    assert user.google_id == "google-123"
+    assert user.is_oauth_user and user.is_verified
+    assert db.query(UserProfile).filter(UserProfile.user_id == user.id).one().profile_picture == GOOGLE_USER["picture"]
+
+def test_register_google_user_links_an_existing_account(db):
+    password = get_password_hash("secret1")
+    db.add(User(email=GOOGLE_USER["email"], password=password, first_name="Old", last_name="Name", role=UserRole.VENDOR))
+    db.commit()
+
+    user, is_new_user = AuthService.register_google_user(db, GOOGLE_USER)
+
+    assert not is_new_user
+    assert user.google_id == "google-123"
+    assert user.first_name == "Kofi"
+    # Linking keeps the account's password and role
+    assert user.password == password
+    assert user.role == UserRole.VENDOR
+    assert db.query(User).count() == 1
+    assert db.query(UserProfile).count() == 0
+
+VALID_CLAIMS = {
+    "iss": "https://accounts.google.com",
+    "aud": "client-id",
+    "email": "google@example.com",
+    "sub": "google-123"
+}
+
+@pytest.fixture(autouse=True)
+def google_client_id(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", "client-id")
+
+def _id_token(**overrides):
+    claims = {**VALID_CLAIMS, "exp": time.time() + 600, **overrides}
+    return jwt.encode({key: value for key, value in claims.items() if value is not None}, "google-key")
+
+def test_id_token_profile_accepts_valid_claims():
+    assert _id_token_profile(_id_token())["email"] == "google@example.com"
+    assert _id_token_profile(_id_token(iss="accounts.google.com")) is not None
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "someone-else"},
+    {"iss": "https://evil.example.com"},
+    {"iss": None},
+    {"exp": time.time() - 1},
+    {"exp": None},
+    {"email": None},
+    {"sub": None},
+])
+def test_id_token_profile_rejects_invalid_claims(overrides):
+    assert _id_token_profile(_id_token(**overrides)) is None
+
+def test_id_token_profile_rejects_garbage():
+    assert _id_token_profile("not-a-jwt") is None
+    assert _id_token_profile(None) is None
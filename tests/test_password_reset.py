@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from app.models.user import PasswordReset
+from app.routes.auth import _consume_reset_token, _reset_token_active, _reset_token_key, _store_reset_token
+from app.services.email import EmailService
+
+def test_reset_token_is_consumed_once(db, user):
+    _store_reset_token(db, "token-1", user.id)
+
+    assert _reset_token_active(db, "token-1")
+    assert _consume_reset_token(db, "token-1") == user.id
+    db.commit()
+    assert _consume_reset_token(db, "token-1") is None
+    assert not _reset_token_active(db, "token-1")
+
+def test_expired_reset_token_is_rejected(db, user):
+    db.add(PasswordReset(user_id=user.id, token="old", expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+    assert not _reset_token_active(db, "old")
+    assert _consume_reset_token(db, "old") is None
+
+def test_reset_token_lives_in_redis_when_configured(db, user, fake_redis):
+    _store_reset_token(db, "token-1", user.id)
+
+    assert fake_redis.exists(_reset_token_key("token-1"))
+    assert db.query(PasswordReset).count() == 0
+    assert _consume_reset_token(db, "token-1") == user.id
+    assert _consume_reset_token(db, "token-1") is None
+
+def test_reset_token_falls_back_to_database_when_redis_is_down(db, user, down_redis):
+    _store_reset_token(db, "token-1", user.id)
+
+    assert db.query(PasswordReset).filter(PasswordReset.token == "token-1").count() == 1
+    assert _reset_token_active(db, "token-1")
+    assert _consume_reset_token(db, "token-1") == user.id
+
+def test_reset_password_form_burns_the_token(client, db, user):
+    token = EmailService.generate_reset_token(user.email)
+    _store_reset_token(db, token, user.id)
+    form = {"token": token, "new_password": "newpass1", "confirm_password": "newpass1"}
+
+    assert client.post("/api/users/reset-password", data=form).status_code == 200
+    assert client.post("/api/users/login", json={"email": user.email, "password": "newpass1"}).status_code == 200
+
+    replay = client.post("/api/users/reset-password", data={**form, "new_password": "newpass2", "confirm_password": "newpass2"})
+    assert "Invalid or expired reset token" in replay.text
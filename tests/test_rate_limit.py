@@ -0,0 +1,33 @@
+from app.core import rate_limit
+
+def test_login_is_rate_limited_per_client_and_email(client, user):
+    credentials = {"email": user.email, "password": "wrong-password"}
+    for _ in range(10):
+        assert client.post("/api/users/login", json=credentials).status_code == 401
+
+    response = client.post("/api/users/login", json=credentials)
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many requests. Please try again later."
+
+    # Other accounts have their own bucket
+    other = {"email": "other@example.com", "password": "wrong-password"}
+    assert client.post("/api/users/login", json=other).status_code == 401
+
+def test_bucket_refills_over_time():
+    for _ in range(3):
+        assert rate_limit._take_local_token("key", 3, 1.0, 100.0)
+    assert not rate_limit._take_local_token("key", 3, 1.0, 100.0)
+    assert rate_limit._take_local_token("key", 3, 1.0, 101.0)
+
+def test_flood_of_new_keys_does_not_reset_an_active_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_LOCAL_MAX_BUCKETS", 100)
+    monkeypatch.setattr(rate_limit, "_LOCAL_EVICT_TO", 90)
+    for _ in range(10):
+        rate_limit._take_local_token("victim", 10, 1 / 30, 0.0)
+
+    for i in range(1000):
+        now = i * 0.001
+        rate_limit._take_local_token(f"throwaway-{i}", 10, 1 / 30, now)
+        assert not rate_limit._take_local_token("victim", 10, 1 / 30, now)
+
+    assert len(rate_limit._local_buckets) <= 100
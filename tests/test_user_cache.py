@@ -0,0 +1,38 @@
+import json
+
+from app.core.dependencies import _user_cache_key, invalidate_cached_user
+from app.models.user import User, UserRole
+
+def test_current_user_is_cached_without_the_password(client, user, auth_headers, fake_redis):
+    assert client.get("/api/users/me", headers=auth_headers).status_code == 200
+
+    cached = json.loads(fake_redis.get(_user_cache_key(user.id)))
+    assert cached["email"] == user.email
+    assert "password" not in cached
+
+def test_invalidation_drops_the_cached_user(client, db, user, auth_headers, fake_redis):
+    client.get("/api/users/me", headers=auth_headers)
+    db.query(User).filter(User.id == user.id).update({User.role: UserRole.VENDOR})
+    db.commit()
+
+    # Served from the cache until the change is invalidated
+    assert client.get("/api/users/me", headers=auth_headers).json()["role"] == "customer"
+    invalidate_cached_user(user.id)
+    assert fake_redis.get(_user_cache_key(user.id)) is None
+    assert client.get("/api/users/me", headers=auth_headers).json()["role"] == "vendor"
+
+def test_change_password_invalidates_and_works_from_cache(client, user, auth_headers, fake_redis):
+    client.get("/api/users/me", headers=auth_headers)
+
+    response = client.post(
+        "/api/users/change-password",
+        json={"current_password": "secret1", "new_password": "secret2"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert fake_redis.get(_user_cache_key(user.id)) is None
+    assert client.post("/api/users/login", json={"email": user.email, "password": "secret2"}).status_code == 200
+
+def test_invalidation_survives_redis_outage(client, user, auth_headers, down_redis):
+    invalidate_cached_user(user.id)
+    assert client.get("/api/users/me", headers=auth_headers).status_code == 200